@@ -2,89 +2,256 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from dataclasses import dataclass
+from functools import partial
+import re
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import ConfigType
 
 from fnos import FnosClient
 
-from .const import DOMAIN  # pylint: disable=import-self
+from .const import (  # pylint: disable=import-self
+    CONF_DEVICE_TOKEN,
+    CONF_PUSH,
+    DEFAULT_PUSH,
+    DOMAIN,
+    PUSH_SECTIONS,
+    SECTION_DISK,
+    SECTION_NET,
+    SECTION_STORE,
+    SECTION_TIERS,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SLOW,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 _PLATFORMS: list[Platform] = [Platform.SENSOR]
 
+# pylint: disable-next=invalid-name
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+# Request name and id of a message, read without decoding it
+_MESSAGE_REQ = re.compile(r'"req"\s*:\s*"([^"]*)"')
+_MESSAGE_REQID = re.compile(r'"reqid"\s*:\s*"([^"]*)"')
+
 @dataclass
 class FnosData:
     """Data for the fnOS integration."""
 
     api: FnosClient
-    coordinator: "FnosCoordinator"
+    connection: "FnosConnection"
+    coordinators: dict[str, "FnosCoordinator"]
+    # Options the coordinators were set up with
+    options: dict
 
 type FnosConfigEntry = ConfigEntry[FnosData]  # noqa: F821
 
 
-def on_message_handler(message):
-    """消息回调处理函数"""
-    print(f"收到消息: {message}")
+def on_message_handler(client, coordinators, message):
+    """消息回调处理函数
+
+    Route sections pushed by fnOS into the coordinator of their tier.
+    Only registered when push is enabled. Every message on the websocket
+    comes through here before the client decodes it, so messages are
+    filtered on their request name and id first, and only the pushes of
+    a known section are decoded.
+    """
+    if not isinstance(message, str):
+        return
+    match = _MESSAGE_REQ.search(message)
+    section = PUSH_SECTIONS.get(match.group(1)) if match else None
+    if section is None:
+        return
+    # Replies to our own requests are delivered to the polling path
+    match = _MESSAGE_REQID.search(message)
+    if match and match.group(1) in client.pending_requests:
+        return
+
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return
+    if (
+        not isinstance(data, dict)
+        or data.get("result") != "succ"
+        or PUSH_SECTIONS.get(data.get("req")) != section
+    ):
+        return
+
+    coordinators[SECTION_TIERS[section]].async_push_section(section, data)
+
+
+async def async_setup(
+    hass: HomeAssistant,
+    config: ConfigType  # pylint: disable=unused-argument
+) -> bool:
+    """Set up the fnOS actions."""
+    from .services import (  # pylint: disable=import-outside-toplevel
+        async_setup_services,
+    )
+
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: FnosConfigEntry
 ) -> bool:
     """Set up fnOS from a config entry."""
     # Import here to avoid circular import
+    from .connection import (  # pylint: disable=import-outside-toplevel
+        FnosConnection,
+    )
     from .coordinator import (  # pylint: disable=import-outside-toplevel
         FnosCoordinator,
+        FnosDevice,
+    )
+    from .scheduler import (  # pylint: disable=import-outside-toplevel
+        async_get_scheduler,
+    )
+    from .snapshot import (  # pylint: disable=import-outside-toplevel
+        FnosSnapshotStore,
     )
 
     _LOGGER.warning("fnos.async_setup_entry called")
 
+    @callback
+    def _async_store_device_token(device_token):
+        """Persist the session so restarts can resume it."""
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_DEVICE_TOKEN: device_token}
+        )
+
     client = FnosClient()
+    connection = FnosConnection(
+        client,
+        entry.data.get(CONF_HOST),
+        entry.data.get(CONF_USERNAME),
+        entry.data.get(CONF_PASSWORD),
+        device_token=entry.data.get(CONF_DEVICE_TOKEN),
+        on_device_token=_async_store_device_token,
+    )
 
-    # 设置消息回调
-    client.on_message(on_message_handler)
+    device = FnosDevice()
+    coordinators = {
+        tier: FnosCoordinator(hass, entry, connection, tier, device)
+        for tier in (TIER_SLOW, TIER_MEDIUM, TIER_FAST)
+    }
 
-    # 连接到服务器（必须指定endpoint）
-    await client.connect(entry.data.get(CONF_HOST))
+    # With the snapshot of the last run, entities are set up right away
+    # and the NAS is reached in the background
+    snapshot = FnosSnapshotStore(hass, entry.entry_id)
+    restored = await snapshot.async_restore(device, coordinators)
 
-    # 使用命令行参数中的用户名和密码
-    result = await client.login(
-        entry.data.get(CONF_USERNAME),
-        entry.data.get(CONF_PASSWORD)
-    )
-    print("登录结果:", result)
+    if not restored:
+        # 连接到服务器并登录，优先复用保存的会话
+        try:
+            await connection.async_connect()
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            await client.close()
+            raise ConfigEntryNotReady(f"Cannot log in to fnOS: {err}") from err
 
-    coordinator = FnosCoordinator(hass, entry, client)
+    # The client is closed once, after the coordinators have shut down
+    entry.async_on_unload(connection.async_close)
 
     entry.runtime_data = FnosData(
         api=client,
-        coordinator=coordinator,
+        connection=connection,
+        coordinators=coordinators,
+        options=dict(entry.options),
     )
 
-    # Fetch initial data so we have data when entities subscribe
-    #
-    # If the refresh fails, async_config_entry_first_refresh will
-    # raise ConfigEntryNotReady and setup will try again later
-    #
-    # If you do not want to retry setup on failure, use
-    # coordinator.async_refresh() instead
-    #
-    await coordinator.async_config_entry_first_refresh()
+    # 设置消息回调
+    if entry.options.get(CONF_PUSH, DEFAULT_PUSH):
+        client.on_message(partial(on_message_handler, client, coordinators))
+
+    if not restored:
+        # Fetch initial data so we have data when entities subscribe
+        #
+        # If the refresh fails, async_config_entry_first_refresh will
+        # raise ConfigEntryNotReady and setup will try again later
+        #
+        # If you do not want to retry setup on failure, use
+        # coordinator.async_refresh() instead
+        #
+        # The slow tier goes first, it loads the device identity shared
+        # by all tiers. Expensive sections are left for the warm-up.
+        #
+        for coordinator in coordinators.values():
+            await coordinator.async_config_entry_first_refresh()
+
+    entry.async_create_background_task(
+        hass,
+        _async_warm_up(entry, coordinators),
+        f"fnOS {entry.title} warm-up",
+    )
+
+    entry.async_on_unload(snapshot.async_track(device, coordinators))
+
+    # Later refreshes are staggered with those of the other entries
+    scheduler = async_get_scheduler(hass)
+    for coordinator in coordinators.values():
+        entry.async_on_unload(scheduler.async_register(coordinator))
+        if coordinator.sampler is not None:
+            entry.async_on_unload(coordinator.async_start_sampling())
+
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, _PLATFORMS)
 
     return True
 
 
+async def _async_warm_up(entry, coordinators) -> None:
+    """Fetch the data setup did not wait for.
+
+    That is all of it after a warm start from the snapshot, and the
+    expensive sections after a first refresh.
+    """
+    async def _async_warm_up_tier(coordinator):
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            _LOGGER.warning(
+                "[%s] fnOS is not reachable, %s data stays unavailable: %s",
+                entry.title, coordinator.tier, coordinator.last_exception
+            )
+
+    # Tiers do not wait for each other, so slow SMART queries do not hold
+    # up the volumes. After a warm start, the first call logs in once.
+    await asyncio.gather(
+        *(
+            _async_warm_up_tier(coordinator)
+            for coordinator in coordinators.values()
+            if coordinator.needs_warm_up
+        )
+    )
+
+
+async def _async_update_listener(
+    hass: HomeAssistant, entry: FnosConfigEntry
+) -> None:
+    """Reload the entry so new polling intervals take effect."""
+    # Storing a renewed session token updates the entry as well
+    if entry.options == entry.runtime_data.options:
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(
     hass: HomeAssistant, entry: FnosConfigEntry
 ) -> bool:
@@ -95,3 +262,41 @@ async def async_unload_entry(
     return await hass.config_entries.async_unload_platforms(
         entry, _PLATFORMS
     )
+
+
+async def async_remove_config_entry_device(
+    hass: HomeAssistant,  # pylint: disable=unused-argument
+    entry: FnosConfigEntry,
+    device_entry
+) -> bool:
+    """Allow removing the device of a volume, disk or interface that is gone."""
+    coordinators = entry.runtime_data.coordinators
+    machine_id = coordinators[TIER_SLOW].machine_id
+    present = {machine_id}
+    for section, tier in (
+        (SECTION_STORE, TIER_MEDIUM),
+        (SECTION_DISK, TIER_SLOW),
+        (SECTION_NET, TIER_FAST),
+    ):
+        resources = coordinators[tier].get_resources(section)
+        if resources is None:
+            # Not fetched yet, the resources are unknown
+            return False
+        present.update(f"{machine_id}_{key}" for key in resources)
+
+    return not any(
+        identifier in present
+        for domain, identifier in device_entry.identifiers
+        if domain == DOMAIN
+    )
+
+
+async def async_remove_entry(
+    hass: HomeAssistant, entry: FnosConfigEntry
+) -> None:
+    """Remove the data snapshot of a removed config entry."""
+    from .snapshot import (  # pylint: disable=import-outside-toplevel
+        FnosSnapshotStore,
+    )
+
+    await FnosSnapshotStore(hass, entry.entry_id).async_remove()
@@ -0,0 +1,77 @@
+"""Polling interval of a tier following the activity of the NAS."""
+from __future__ import annotations
+
+from .const import SECTION_CPU, SECTION_DISK_RESMON, SECTION_NET
+
+# Fields telling how busy the NAS is, per section, with the value from
+# which the NAS counts as busy: percent for CPU and disks, bytes per
+# second for interfaces
+ACTIVITY_FIELDS = {
+    SECTION_CPU: (("busy_all", 50.0),),
+    SECTION_NET: (("transmit", 1_000_000), ("receive", 1_000_000)),
+    SECTION_DISK_RESMON: (("busy", 50.0),),
+}
+
+# A value moving by more than this fraction of its busy threshold between
+# refreshes counts as activity as well
+CHANGE_FRACTION = 0.2
+
+# The interval is divided by SPEEDUP after an active refresh, down to the
+# configured interval divided by MAX_SPEEDUP, and multiplied by SLOWDOWN
+# after a flat one, up to the maximum
+SPEEDUP = 2
+MAX_SPEEDUP = 4
+SLOWDOWN = 1.5
+
+
+class FnosAdaptiveInterval:
+    """Shorten the interval of a tier while the NAS is busy, lengthen if idle.
+
+    Refreshes where an activity value is above its busy threshold, or
+    moved noticeably since the previous refresh, halve the interval so a
+    heavy transfer is followed closely. Flat refreshes stretch it little
+    by little, so an idle NAS is polled rarely.
+    """
+
+    def __init__(self, interval: float, max_interval: float) -> None:
+        """Initialize from the configured interval of the tier."""
+        self.min_interval = max(1.0, interval / MAX_SPEEDUP)
+        self.max_interval = max(interval, max_interval)
+        self.interval = float(interval)
+        # (section, resource, field) -> value of the previous refresh
+        self._previous: dict[tuple, float] = {}
+
+    def update(self, data) -> float:
+        """Return the interval to use after a refresh of data."""
+        values = {}
+        active = False
+        for key, value, threshold in _activity_values(data):
+            previous = self._previous.get(key)
+            if value >= threshold or (
+                previous is not None
+                and abs(value - previous) > CHANGE_FRACTION * threshold
+            ):
+                active = True
+            values[key] = value
+        self._previous = values
+
+        if active:
+            self.interval = max(self.min_interval, self.interval / SPEEDUP)
+        else:
+            self.interval = min(self.max_interval, self.interval * SLOWDOWN)
+        return self.interval
+
+
+def _activity_values(data):
+    """Yield (section, resource, field), value and busy threshold of values."""
+    for section, fields in ACTIVITY_FIELDS.items():
+        records = data.get(section)
+        if records is None:
+            continue
+        if not isinstance(records, tuple):
+            records = (records,)
+        for record in records:
+            resource = getattr(record, "name", None)
+            for field, threshold in fields:
+                if (value := getattr(record, field)) is not None:
+                    yield (section, resource, field), value, threshold
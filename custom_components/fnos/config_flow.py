@@ -7,12 +7,38 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, CONF_NAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN
+from .const import (
+    CONF_ADAPTIVE,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_DEVICE_TOKEN,
+    CONF_FAST_INTERVAL,
+    CONF_PUSH,
+    CONF_MEDIUM_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    CONF_SMART_CONCURRENCY,
+    CONF_SMART_TTL,
+    DEFAULT_ADAPTIVE,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_FAST_INTERVAL,
+    DEFAULT_MEDIUM_INTERVAL,
+    DEFAULT_PUSH,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SLOW_INTERVAL,
+    DEFAULT_SMART_CONCURRENCY,
+    DEFAULT_SMART_TTL,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -32,16 +58,22 @@ class FnosHub:
         """Initialize."""
         self.host = host
         self._client = None
+        self.device_token = None
 
     async def authenticate(self, username: str, password: str) -> bool:
         """Test if we can authenticate with the host."""
         try:
             # pylint: disable=import-outside-toplevel
             from fnos import FnosClient
+            from .connection import device_token_of
             self._client = FnosClient()
             await self._client.connect(self.host)
             result = await self._client.login(username, password)
-            return result.get("result", "succ") == 'succ'
+            if result.get("result", "succ") != 'succ':
+                return False
+            # Handed over to setup, which resumes the session with it
+            self.device_token = device_token_of(self._client)
+            return True
         except Exception as exc:  # pylint: disable=broad-exception-caught
             _LOGGER.exception("Authentication failed: %s", exc)
             return False
@@ -49,7 +81,8 @@ class FnosHub:
     async def disconnect(self) -> None:
         """Disconnect from the host."""
         if self._client:
-            await self._client.disconnect()
+            await self._client.close()
+            self._client = None
 
 
 async def validate_input(
@@ -63,12 +96,15 @@ async def validate_input(
     """
     hub = FnosHub(data[CONF_HOST])
 
-    if not await hub.authenticate(
-        data[CONF_USERNAME], data[CONF_PASSWORD]
-    ):
-        raise InvalidAuth
+    try:
+        if not await hub.authenticate(
+            data[CONF_USERNAME], data[CONF_PASSWORD]
+        ):
+            raise InvalidAuth
+    finally:
+        await hub.disconnect()
 
-    return {}
+    return {CONF_DEVICE_TOKEN: hub.device_token}
 
 
 class FnosConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -86,7 +122,7 @@ class FnosConfigFlow(ConfigFlow, domain=DOMAIN):
             friendly_name = user_input.get(CONF_NAME)
 
             try:
-                await validate_input(self.hass, user_input)
+                info = await validate_input(self.hass, user_input)
             except CannotConnect:
                 errors["base"] = "cannot_connect"
             except InvalidAuth:
@@ -96,7 +132,7 @@ class FnosConfigFlow(ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
             else:
                 return self.async_create_entry(
-                    title=friendly_name or host, data=user_input
+                    title=friendly_name or host, data={**user_input, **info}
                 )
 
         return self.async_show_form(
@@ -105,6 +141,86 @@ class FnosConfigFlow(ConfigFlow, domain=DOMAIN):
             errors=errors
         )
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return FnosOptionsFlow(config_entry)
+
+
+class FnosOptionsFlow(OptionsFlow):
+    """Handle fnOS options."""
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the polling intervals of each tier and caching."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self._entry.options
+        interval = vol.All(vol.Coerce(int), vol.Range(min=1))
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_FAST_INTERVAL,
+                        default=options.get(
+                            CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL
+                        ),
+                    ): interval,
+                    vol.Required(
+                        CONF_MEDIUM_INTERVAL,
+                        default=options.get(
+                            CONF_MEDIUM_INTERVAL, DEFAULT_MEDIUM_INTERVAL
+                        ),
+                    ): interval,
+                    vol.Required(
+                        CONF_SLOW_INTERVAL,
+                        default=options.get(
+                            CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL
+                        ),
+                    ): interval,
+                    vol.Required(
+                        CONF_SAMPLE_INTERVAL,
+                        default=options.get(
+                            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_ADAPTIVE,
+                        default=options.get(CONF_ADAPTIVE, DEFAULT_ADAPTIVE),
+                    ): bool,
+                    vol.Required(
+                        CONF_ADAPTIVE_MAX_INTERVAL,
+                        default=options.get(
+                            CONF_ADAPTIVE_MAX_INTERVAL,
+                            DEFAULT_ADAPTIVE_MAX_INTERVAL,
+                        ),
+                    ): interval,
+                    vol.Required(
+                        CONF_SMART_TTL,
+                        default=options.get(CONF_SMART_TTL, DEFAULT_SMART_TTL),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Required(
+                        CONF_SMART_CONCURRENCY,
+                        default=options.get(
+                            CONF_SMART_CONCURRENCY, DEFAULT_SMART_CONCURRENCY
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1)),
+                    vol.Required(
+                        CONF_PUSH,
+                        default=options.get(CONF_PUSH, DEFAULT_PUSH),
+                    ): bool,
+                }
+            ),
+        )
+
 
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
@@ -0,0 +1,303 @@
+"""Connection to fnOS shared by the coordinators of a config entry."""
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+import logging
+import random
+import time
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from fnos import FnosClient, NotConnectedError
+from websockets.exceptions import ConnectionClosed
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_OPEN_TIME,
+    RECONNECT_BACKOFF_BASE,
+    RECONNECT_BACKOFF_MAX,
+)
+from .stats import FnosStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _SocketDropped(NotConnectedError):
+    """Failure of a request left waiting on a socket closed since."""
+
+
+class FnosConnection:
+    """Wrap the fnOS client and recover it when the socket drops.
+
+    All callers share one reconnect attempt. Failed attempts are spaced
+    out with an exponential backoff, and after repeated failures the
+    circuit opens: calls fail right away with UpdateFailed until the
+    next attempt is due, so a rebooting NAS is not hammered with logins.
+    """
+
+    def __init__(
+        self,
+        api: FnosClient,
+        host: str,
+        username: str,
+        password: str,
+        device_token: dict | None = None,
+        on_device_token=None,
+    ) -> None:
+        """Initialize the connection."""
+        self.api = api
+        self.host = host
+        self._username = username
+        self._password = password
+        self.device_token = device_token
+        # Called with the new device token whenever a login renews it
+        self._on_device_token = on_device_token
+        self.stats = FnosStats()
+        self._reconnect_task: asyncio.Task | None = None
+        self._failures = 0
+        # Monotonic time before which no reconnect is attempted
+        self._retry_at = 0.0
+        # (method name, args) -> call in flight, joined by identical calls
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+
+    async def async_connect(self) -> None:
+        """Connect to fnOS and log in."""
+        await self.api.connect(self.host)
+        await self.async_login()
+
+    async def async_login(self) -> None:
+        """Log in, resuming the stored session before using the password.
+
+        Resuming saves the RSA/AES handshake of a password login, and
+        keeps fnOS from registering a new device on every restart.
+        """
+        if self.device_token and await self._async_login_via_token():
+            return
+
+        result = await self.api.login(self._username, self._password)
+        if not result or result.get("result") != "succ":
+            raise UpdateFailed(f"Logging in to fnOS failed: {result}")
+        self._store_device_token()
+
+    async def _async_login_via_token(self) -> bool:
+        """Resume the stored session, return False if it has expired."""
+        try:
+            result = await self.api.login_via_token(
+                self.device_token["token"],
+                self.device_token["long_token"],
+                self.device_token["secret"],
+            )
+        except NotConnectedError:
+            raise
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.debug("Resuming the fnOS session failed: %s", err)
+            return False
+
+        if not result or result.get("result") != "succ":
+            _LOGGER.debug("Stored fnOS session was rejected: %s", result)
+            return False
+
+        # The short lived token is renewed from the long one
+        self._store_device_token()
+        return True
+
+    def _store_device_token(self) -> None:
+        """Remember the session of the client, reporting when it changed."""
+        device_token = device_token_of(self.api)
+        if device_token == self.device_token:
+            return
+
+        self.device_token = device_token
+        if self._on_device_token is not None:
+            self._on_device_token(device_token)
+
+    @property
+    def circuit_open(self) -> bool:
+        """Return True while calls are failed without reaching fnOS."""
+        return self._failures >= CIRCUIT_FAILURE_THRESHOLD
+
+    async def async_call(self, method, *args):
+        """Call a fnOS API method, reconnecting if the socket dropped.
+
+        Calls are pipelined: concurrent callers send their requests back
+        to back over the socket and the client matches the replies by
+        reqid, so the calls of a refresh cost about one round trip. An
+        identical call already in flight, such as resmon.disk of another
+        tier, is joined rather than sent again.
+        """
+        key = (method.__qualname__, args)
+        if (future := self._in_flight.get(key)) is None:
+            future = asyncio.ensure_future(self._async_call(method, *args))
+            future.add_done_callback(partial(self._call_done, key))
+            self._in_flight[key] = future
+        # A cancelled caller must not cancel the call of the others
+        return await asyncio.shield(future)
+
+    def _call_done(self, key, future: asyncio.Future) -> None:
+        """Forget the finished call."""
+        del self._in_flight[key]
+        if not future.cancelled():
+            # Retrieved by the awaiting callers, if there are still any
+            future.exception()
+
+    async def _async_call(self, method, *args):
+        """Make a call, reconnecting once if the socket dropped."""
+        if not self.api.connected:
+            await self.async_reconnect()
+        try:
+            return await self._async_timed_call(method, *args)
+        except (NotConnectedError, ConnectionClosed) as err:
+            # The client misses sockets closed cleanly by the server, but
+            # a socket dropped here may already have been replaced
+            if not isinstance(err, _SocketDropped):
+                self.api.connected = False
+            await self.async_reconnect()
+        except Exception as err:  # pylint: disable=broad-except
+            if not _is_timeout(err):
+                raise
+            await self._async_drop(err)
+
+        try:
+            return await self._async_timed_call(method, *args)
+        except (NotConnectedError, ConnectionClosed) as err:
+            if not isinstance(err, _SocketDropped):
+                self.api.connected = False
+            raise UpdateFailed(f"Lost connection to fnOS: {err}") from err
+        except Exception as err:  # pylint: disable=broad-except
+            if not _is_timeout(err):
+                raise
+            await self._async_drop(err)
+
+    async def _async_drop(self, err) -> None:
+        """Give up on a socket that stopped answering, raise UpdateFailed.
+
+        The next call reconnects. Waiting out the timeout of the client
+        again on a new socket would only make the refresh slower.
+        """
+        _LOGGER.debug("fnOS stopped answering, dropping the socket: %s", err)
+        await self._async_close_quietly()
+        raise UpdateFailed(f"fnOS did not answer: {err}") from err
+
+    async def _async_timed_call(self, method, *args):
+        """Call a fnOS API method, recording its latency and response size."""
+        start = time.time()
+        started = time.monotonic()
+        try:
+            resp = await method(*args)
+        except Exception as err:
+            duration = time.monotonic() - started
+            self.stats.record_failure(method, start, duration, err)
+            raise
+        duration = time.monotonic() - started
+        self.stats.record_call(method, start, duration, resp)
+        return resp
+
+    async def async_reconnect(self) -> None:
+        """Reconnect to fnOS, letting concurrent callers share one attempt."""
+        if self.api.connected:
+            return
+
+        remaining = self._retry_at - time.monotonic()
+        if remaining > 0:
+            raise UpdateFailed(
+                f"fnOS is unreachable, next reconnect in {remaining:.0f}s"
+            )
+
+        if self._reconnect_task is None:
+            self._reconnect_task = asyncio.ensure_future(
+                self._async_reconnect()
+            )
+            self._reconnect_task.add_done_callback(self._reconnect_done)
+        # A cancelled caller must not cancel the attempt of the others
+        await asyncio.shield(self._reconnect_task)
+
+    def _reconnect_done(self, task: asyncio.Task) -> None:
+        """Forget the finished attempt."""
+        self._reconnect_task = None
+        if not task.cancelled():
+            # Retrieved by the awaiting callers, if there are still any
+            task.exception()
+
+    async def _async_reconnect(self) -> None:
+        """Make one reconnect attempt and schedule the next on failure."""
+        # Stop the heartbeat and message tasks of the dead socket
+        await self._async_close_quietly()
+        try:
+            await self.api.connect(self.host)
+            await self.async_login()
+        except Exception as err:  # pylint: disable=broad-except
+            self.stats.record_reconnect(err)
+            # Do not leave a connected but unauthenticated socket behind
+            await self._async_close_quietly()
+            self._failures += 1
+            if self.circuit_open:
+                delay = CIRCUIT_OPEN_TIME
+                if self._failures == CIRCUIT_FAILURE_THRESHOLD:
+                    _LOGGER.warning(
+                        "Reconnecting to fnOS failed %s times, "
+                        "pausing for %ss: %s",
+                        self._failures, delay, err
+                    )
+            else:
+                delay = min(
+                    RECONNECT_BACKOFF_MAX,
+                    RECONNECT_BACKOFF_BASE * 2 ** (self._failures - 1),
+                )
+            # Jitter so that entries of one NAS do not retry in lockstep
+            delay = random.uniform(delay / 2, delay)
+            self._retry_at = time.monotonic() + delay
+            raise UpdateFailed(f"Reconnecting to fnOS failed: {err}") from err
+
+        self.stats.record_reconnect()
+        if self._failures:
+            _LOGGER.info(
+                "Reconnected to fnOS after %s failed attempts", self._failures
+            )
+        self._failures = 0
+        self._retry_at = 0.0
+
+    async def _async_close_quietly(self) -> None:
+        """Close the client, ignoring errors of an already broken socket.
+
+        Requests still waiting for an answer on the socket fail right away,
+        so that their callers reconnect instead of waiting out the timeout
+        of the client.
+        """
+        try:
+            await self.api.close()
+        except Exception:  # pylint: disable=broad-except
+            pass
+        self.api.connected = False
+        pending = self.api.pending_requests
+        for request in list(pending.values()):
+            if not request["future"].done():
+                request["future"].set_exception(
+                    _SocketDropped("Connection to fnOS dropped")
+                )
+        pending.clear()
+
+    async def async_close(self) -> None:
+        """Stop reconnecting and close the client."""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        for future in list(self._in_flight.values()):
+            future.cancel()
+        await self.api.close()
+
+
+def _is_timeout(err: Exception) -> bool:
+    """Return True if a call failed because no answer came in time."""
+    # The client raises a bare Exception from the TimeoutError of its wait
+    return isinstance(err, TimeoutError) or isinstance(
+        err.__context__, TimeoutError
+    )
+
+
+def device_token_of(api: FnosClient) -> dict:
+    """Return what is needed to resume the session of a logged in client."""
+    return {
+        "token": api.token,
+        "long_token": api.long_token,
+        "secret": api.decrypted_secret,
+    }
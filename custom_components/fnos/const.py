@@ -13,3 +13,131 @@ CONF_BACKUP_PATH = "backup_path"
 CONF_NETWORK_IFS = "network_ifs"
 
 ENTITY_UNIT_LOAD = "load"
+
+# Polling tiers: each tier is refreshed by its own coordinator
+TIER_FAST = "fast"
+TIER_MEDIUM = "medium"
+TIER_SLOW = "slow"
+
+CONF_FAST_INTERVAL = "fast_interval"
+CONF_MEDIUM_INTERVAL = "medium_interval"
+CONF_SLOW_INTERVAL = "slow_interval"
+
+DEFAULT_FAST_INTERVAL = 5
+DEFAULT_MEDIUM_INTERVAL = 60
+DEFAULT_SLOW_INTERVAL = 3600
+
+# Option key and default interval (seconds) of each tier
+TIER_INTERVALS = {
+    TIER_FAST: (CONF_FAST_INTERVAL, DEFAULT_FAST_INTERVAL),
+    TIER_MEDIUM: (CONF_MEDIUM_INTERVAL, DEFAULT_MEDIUM_INTERVAL),
+    TIER_SLOW: (CONF_SLOW_INTERVAL, DEFAULT_SLOW_INTERVAL),
+}
+
+# SMART results are cached per disk serial number for this long (seconds)
+CONF_SMART_TTL = "smart_ttl"
+DEFAULT_SMART_TTL = 21600
+
+# At most this many SMART queries run on the NAS at the same time
+CONF_SMART_CONCURRENCY = "smart_concurrency"
+DEFAULT_SMART_CONCURRENCY = 2
+
+# Apply data pushed over the websocket, polling only reconciles
+CONF_PUSH = "push"
+DEFAULT_PUSH = False
+PUSH_RECONCILE_INTERVAL = 300
+
+# Sample CPU and network this often (seconds) and publish the mean over
+# the refresh interval, 0 publishes the value of each refresh
+CONF_SAMPLE_INTERVAL = "sample_interval"
+DEFAULT_SAMPLE_INTERVAL = 0
+
+# Poll tiers with CPU, network or disk activity more often while the NAS
+# is busy, and less often, up to the maximum (seconds), while it is idle
+CONF_ADAPTIVE = "adaptive"
+DEFAULT_ADAPTIVE = False
+CONF_ADAPTIVE_MAX_INTERVAL = "adaptive_max_interval"
+DEFAULT_ADAPTIVE_MAX_INTERVAL = 300
+
+# Refreshes of one tier of all fnOS entries running at the same time
+FLEET_CONCURRENCY = 2
+
+# Seconds after the device or its resources change the data snapshot used
+# for warm starts is saved
+SNAPSHOT_SAVE_DELAY = 600
+# Seconds after values alone change the snapshot is saved; Home Assistant
+# writes pending saves when it stops anyway
+SNAPSHOT_VALUES_SAVE_DELAY = 6 * 3600
+
+# Sections fetched less than this many seconds ago are not fetched again
+# by the refresh action
+REFRESH_MIN_AGE = 5
+
+# Reconnect backoff in seconds, the circuit opens after repeated failures
+RECONNECT_BACKOFF_BASE = 2
+RECONNECT_BACKOFF_MAX = 120
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_TIME = 300
+
+# Endpoint groups API call statistics are kept for
+ENDPOINT_RESMON = "resmon"
+ENDPOINT_SYSINFO = "sysinfo"
+ENDPOINT_STORE = "store"
+ENDPOINT_SMART = "smart"
+ENDPOINT_GROUPS = (
+    ENDPOINT_RESMON, ENDPOINT_SYSINFO, ENDPOINT_STORE, ENDPOINT_SMART
+)
+# Number of calls the latency statistics are computed over
+STATS_WINDOW = 100
+# Refresh cycles and reconnects kept for the diagnostics download
+DIAGNOSTICS_CYCLES = 30
+DIAGNOSTICS_RECONNECTS = 20
+
+# Sections of coordinator data
+SECTION_CPU = "cpu"
+SECTION_MEMORY = "memory"
+SECTION_NET = "net"
+SECTION_UPTIME = "uptime"
+SECTION_STORE = "store"
+SECTION_DISK_RESMON = "disk_resmon"
+SECTION_DISK = "disk"
+SECTION_SMART = "smart"
+
+TIER_SECTIONS = {
+    TIER_FAST: (SECTION_CPU, SECTION_MEMORY, SECTION_NET),
+    TIER_MEDIUM: (SECTION_UPTIME, SECTION_STORE, SECTION_DISK_RESMON),
+    TIER_SLOW: (SECTION_DISK, SECTION_SMART),
+}
+
+# Expensive sections left out of the first refresh, so setup does not
+# wait for them; a background warm-up fetches them right after
+DEFERRED_SECTIONS = (SECTION_STORE, SECTION_SMART)
+
+SECTION_TIERS = {
+    section: tier
+    for tier, sections in TIER_SECTIONS.items()
+    for section in sections
+}
+
+# Sections fnOS may push, by the request name of the message
+PUSH_SECTIONS = {
+    "appcgi.resmon.cpu": SECTION_CPU,
+    "appcgi.resmon.mem": SECTION_MEMORY,
+    "appcgi.resmon.net": SECTION_NET,
+    "appcgi.resmon.disk": SECTION_DISK_RESMON,
+    "appcgi.sysinfo.getUptime": SECTION_UPTIME,
+    "stor.general": SECTION_STORE,
+}
+
+# Sections refreshed by the refresh action, by the name it is called with
+SERVICE_REFRESH = "refresh"
+ATTR_SECTIONS = "sections"
+REFRESH_SECTIONS = {
+    "cpu": (SECTION_CPU,),
+    "memory": (SECTION_MEMORY,),
+    "network": (SECTION_NET,),
+    "storage": (SECTION_STORE,),
+    "disks": (SECTION_DISK, SECTION_DISK_RESMON),
+    "smart": (SECTION_SMART,),
+    "system": (SECTION_UPTIME,),
+}
@@ -1,8 +1,17 @@
 """fnOS coordinator for Home Assistant."""
+import asyncio
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import partial
 import logging
+import math
+import operator
+import time
 import uuid
 
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.helpers.device_registry import DeviceInfo
 
@@ -10,34 +19,256 @@ from fnos import (
     SystemInfo,
     ResourceMonitor,
     Store,
-    NotConnectedError,
 )
 
-from .const import DOMAIN
+from .const import (
+    CONF_ADAPTIVE,
+    CONF_ADAPTIVE_MAX_INTERVAL,
+    CONF_PUSH,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SMART_CONCURRENCY,
+    CONF_SMART_TTL,
+    DEFAULT_ADAPTIVE,
+    DEFAULT_ADAPTIVE_MAX_INTERVAL,
+    DEFAULT_PUSH,
+    DEFAULT_SAMPLE_INTERVAL,
+    DEFAULT_SMART_CONCURRENCY,
+    DEFAULT_SMART_TTL,
+    DEFERRED_SECTIONS,
+    DOMAIN,
+    PUSH_RECONCILE_INTERVAL,
+    PUSH_SECTIONS,
+    REFRESH_MIN_AGE,
+    SECTION_CPU,
+    SECTION_DISK,
+    SECTION_DISK_RESMON,
+    SECTION_MEMORY,
+    SECTION_NET,
+    SECTION_SMART,
+    SECTION_STORE,
+    SECTION_UPTIME,
+    TIER_INTERVALS,
+    TIER_SECTIONS,
+    TIER_SLOW,
+)
+from .models import (
+    CpuRecord,
+    DiskRecord,
+    DiskResmonRecord,
+    InterfaceRecord,
+    MemoryRecord,
+    SmartRecord,
+    VolumeRecord,
+    smart_status_passed,
+)
+from .adaptive import ACTIVITY_FIELDS, FnosAdaptiveInterval
+from .sampler import SAMPLED_FIELDS, FnosSampler
 
 _LOGGER = logging.getLogger(__name__)
 
+# Sections listing resources, by the attribute keying their records
+_INDEXED_SECTIONS = {
+    SECTION_STORE: "uuid",
+    SECTION_NET: "name",
+    SECTION_DISK: "serial_number",
+    SECTION_DISK_RESMON: "name",
+    SECTION_SMART: "serial_number",
+}
+
+
+# Errors of a value derived from a record missing some field
+_EXTRACT_ERRORS = (AttributeError, TypeError, ValueError, ZeroDivisionError)
+
+
+def compile_extractor(description):
+    """Compile the value of a sensor description into a function of its record.
+
+    A missing record or field gives None, which entities show as
+    unavailable, rather than an exception.
+    """
+    if description.field is not None:
+        getter = operator.attrgetter(description.field)
+    else:
+        getter = description.value_fn
+
+    def extract(record):
+        if record is None:
+            return None
+        try:
+            return getter(record)
+        except _EXTRACT_ERRORS:
+            return None
+
+    return extract
+
+
+def _extract_section(section, resp):
+    """Build the compact records of a section from a fnOS response."""
+    if section == SECTION_STORE:
+        return tuple(
+            VolumeRecord.from_dict(item) for item in resp.get("array") or ()
+        )
+    if section == SECTION_DISK_RESMON:
+        return tuple(
+            DiskResmonRecord.from_dict(item)
+            for item in resp.get("data").get("disk") or ()
+        )
+    data = resp.get("data")
+    if section == SECTION_NET:
+        return tuple(
+            InterfaceRecord.from_dict(item) for item in data.get("ifs") or ()
+        )
+    if section == SECTION_CPU:
+        return CpuRecord.from_dict(data)
+    if section == SECTION_MEMORY:
+        return MemoryRecord.from_dict(data)
+    if section == SECTION_UPTIME:
+        return data.get("uptime")
+    raise ValueError(f"Unknown section {section}")
+
+
+@dataclass
+class FnosDevice:
+    """Identity of a fnOS device, shared by the coordinators of an entry."""
+
+    machine_id: str | None = None
+    # hostName实际上“设置”页可修改的“设备名称”
+    host_name: str | None = None
+    trim_version: str | None = None
+    model: str | None = None
+    device_info: DeviceInfo | None = None
+    # serialNumber -> name of the disks currently present
+    disk_names: dict[str, str] = field(default_factory=dict)
+
+    def set_identity(self, machine_id, model):
+        """Set the machine id and model, and build the device info."""
+        self.machine_id = machine_id
+        self.model = model
+        self.device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"{machine_id}")},
+            name=f"{self.host_name}",
+            manufacturer="fnOS",
+            model=model,
+            sw_version=self.trim_version,
+            via_device=(DOMAIN, machine_id),
+            #configuration_url="self._api.config_url",
+        )
+
+
 class FnosCoordinator(DataUpdateCoordinator):
-    """My custom coordinator."""
+    """Coordinator refreshing the sections of one polling tier."""
 
-    def __init__(self, hass, config_entry, api):
+    def __init__(self, hass, config_entry, connection, tier, device):
         """Initialize my coordinator."""
+        option, default = TIER_INTERVALS[tier]
+        interval = config_entry.options.get(option, default)
+        push = config_entry.options.get(CONF_PUSH, DEFAULT_PUSH)
+        # With push, polling of fully pushed tiers only reconciles
+        pushed = push and all(
+            section in PUSH_SECTIONS.values() for section in TIER_SECTIONS[tier]
+        )
+        if pushed:
+            interval = max(interval, PUSH_RECONCILE_INTERVAL)
         super().__init__(
             hass,
             _LOGGER,
-            name="fnOS",
+            name=f"fnOS {tier}",
             config_entry=config_entry,
-            update_interval=timedelta(seconds=30),
-            always_update=True
+            # Refreshes are scheduled by the fleet scheduler
+            update_interval=None,
+            # Listeners are notified per changed section
+            always_update=False,
         )
-        self.api = api
+        self.interval = timedelta(seconds=interval)
+        self.connection = connection
+        self.api = connection.api
+        self.tier = tier
+        self.device = device
         self.system_info = SystemInfo(self.api)
         self.res_mon = ResourceMonitor(self.api)
         self.stor = Store(self.api)
+        # serialNumber -> (monotonic time fetched, SMART passed)
+        self._smart_cache = {}
+        self._smart_ttl = config_entry.options.get(
+            CONF_SMART_TTL, DEFAULT_SMART_TTL
+        )
+        self._smart_semaphore = asyncio.Semaphore(
+            config_entry.options.get(
+                CONF_SMART_CONCURRENCY, DEFAULT_SMART_CONCURRENCY
+            )
+        )
+        self._simple_sections = {
+            SECTION_UPTIME: self.system_info.get_uptime,
+            SECTION_CPU: self.res_mon.cpu,
+            SECTION_MEMORY: self.res_mon.memory,
+            SECTION_NET: self.res_mon.net,
+        }
         self.data = None
-        self.machine_id = None
-        self.device_id = None
-        self.device_info = None
+        # section -> resource key -> record, rebuilt whenever data changes
+        self._index = {}
+        # section -> [(description key, extractor)] of the values read
+        self._extractors = {}
+        # section -> (records, {(key, resource): value}) last projected
+        self._projections = {}
+        # (key, resource) -> value, the resource is None for sections
+        # with a single record
+        self._values = {}
+        # (last_update_success, data) listeners were last notified of
+        self._notified = None
+        # section -> fetch in flight, joined by refreshes overlapping it
+        self._fetches = {}
+        # section -> monotonic time it was last fetched
+        self._fetched_at = {}
+        # Data comes from the persisted snapshot, not from the NAS yet
+        self._restored = False
+        # Sections only inventory listeners read are looked at for new
+        # resources at the pace of the slow tier
+        option, default = TIER_INTERVALS[TIER_SLOW]
+        self._inventory_interval = config_entry.options.get(option, default)
+
+        # Pushed data is already frequent, sampling only applies to polling
+        self.sample_interval = config_entry.options.get(
+            CONF_SAMPLE_INTERVAL, DEFAULT_SAMPLE_INTERVAL
+        )
+        self.sampled_sections = ()
+        if self.sample_interval and not push:
+            self.sampled_sections = tuple(
+                section for section in TIER_SECTIONS[tier]
+                if section in SAMPLED_FIELDS
+            )
+        self.sampler = None
+        if self.sampled_sections:
+            self.sampler = FnosSampler(self._sample_window(interval))
+
+        # The interval follows the activity values fetched by the tier
+        self.adaptive = None
+        if (
+            config_entry.options.get(CONF_ADAPTIVE, DEFAULT_ADAPTIVE)
+            and not pushed
+            and any(
+                section in ACTIVITY_FIELDS for section in TIER_SECTIONS[tier]
+            )
+        ):
+            self.adaptive = FnosAdaptiveInterval(
+                interval,
+                config_entry.options.get(
+                    CONF_ADAPTIVE_MAX_INTERVAL, DEFAULT_ADAPTIVE_MAX_INTERVAL
+                ),
+            )
+        # Contexts of the listeners that do not keep polling going, counted
+        # per listener
+        self._passive_contexts = Counter()
+        self._sampling = False
+
+    @property
+    def machine_id(self):
+        """Return the machine id of the fnOS device."""
+        return self.device.machine_id
+
+    @property
+    def device_info(self):
+        """Return the device info of the fnOS device."""
+        return self.device.device_info
 
     async def _async_setup(self):
         """Set up the coordinator
@@ -54,29 +285,19 @@ class FnosCoordinator(DataUpdateCoordinator):
             self.config_entry.title, job_id
         )
 
-        self.data = await self._async_retrieve_from_fnos(job_id)
+        # The device identity is shared, the first tier to set up loads it
+        if self.device.machine_id is not None:
+            return
 
-        machine_id_resp = await self.system_info.get_machine_id()
+        machine_id_resp, hardware_info_resp = await asyncio.gather(
+            self._async_call(self.system_info.get_machine_id),
+            self._async_call(self.system_info.get_hardware_info),
+        )
         machine_id = machine_id_resp.get("data").get("machineId")
-        self.machine_id = machine_id
-
-        # hostName实际上“设置”页可修改的“设备名称”
-        host_name = self.data.get("host_name").get("hostName")
-        trim_version = self.data.get("host_name").get("trimVersion")
-
-        hardware_info_resp = await self.system_info.get_hardware_info()
+        self._update_device_names()
         cpu_name = hardware_info_resp.get("data").get("cpu").get("name")
 
-        self.device_id = machine_id
-        self.device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"{machine_id}")},
-            name=f"{host_name}",
-            manufacturer="fnOS",
-            model=cpu_name,
-            sw_version=trim_version,
-            via_device=(DOMAIN, machine_id),
-            #configuration_url="self._api.config_url",
-        )
+        self.device.set_identity(machine_id, cpu_name)
 
     async def async_setup(self):
         """Set up coordinator."""
@@ -86,11 +307,6 @@ class FnosCoordinator(DataUpdateCoordinator):
         """Generate a unique job ID."""
         return uuid.uuid4().hex
 
-    async def async_shutdown(self) -> None:
-        """Shutdown the coordinator."""
-        if self.api:
-            await self.api.disconnect()
-
     async def _async_update_data(self):
         """Fetch data from API endpoint.
 
@@ -99,11 +315,29 @@ class FnosCoordinator(DataUpdateCoordinator):
         """
         job_id = self._generate_job_id()
         _LOGGER.warning(
-            "[%s] [%s] _async_update_data called",
-            self.config_entry.title, job_id
+            "[%s] [%s] [%s] _async_update_data called",
+            self.config_entry.title, self.tier, job_id
         )
 
-        return await self._async_retrieve_from_fnos(job_id)
+        stats = self.connection.stats
+        cycle = stats.start_refresh(self.tier)
+        try:
+            data = await self._async_retrieve_from_fnos(job_id)
+        except Exception as err:
+            stats.end_refresh(cycle, err)
+            raise
+        stats.end_refresh(cycle)
+        if self.adaptive is not None:
+            interval = self.adaptive.update(data)
+            self.interval = timedelta(seconds=interval)
+            # The published mean spans the samples of one interval
+            if self.sampler is not None:
+                self.sampler.resize(self._sample_window(interval))
+        return data
+
+    def _sample_window(self, interval):
+        """Return the number of samples taken over a refresh interval."""
+        return max(1, math.ceil(interval / self.sample_interval))
 
     async def _async_retrieve_from_fnos(self, job_id):
         # try:
@@ -124,107 +358,507 @@ class FnosCoordinator(DataUpdateCoordinator):
         # except ApiError as err:
         #     raise UpdateFailed(f"Error communicating with API: {err}")
 
+        fetched = await self._async_fetch(self._sections_to_fetch(), job_id)
+        data = self._merge(fetched)
 
-        try:
-            host_name_resp = await self.system_info.get_host_name()
-        except NotConnectedError:
-            await self.api.reconnect()
-            host_name_resp = await self.system_info.get_host_name()
-
-        try:
-            uptime_result = await self.system_info.get_uptime()
-        except NotConnectedError:
-            await self.api.reconnect()
-            uptime_result = await self.system_info.get_uptime()
-
-        try:
-            cpu_result = await self.res_mon.cpu()
-        except NotConnectedError:
-            await self.api.reconnect()
-            cpu_result = await self.res_mon.cpu()
-
-        try:
-            memory_result = await self.res_mon.memory()
-        except NotConnectedError:
-            await self.api.reconnect()
-            memory_result = await self.res_mon.memory()
-
-        try:
-            store_result = await self.stor.general()
-        except NotConnectedError:
-            await self.api.reconnect()
-            store_result = await self.stor.general()
         _LOGGER.warning(
-            "[%s] [%s] _async_update_data got stor.general %s",
-            self.config_entry.title, job_id, store_result
+            "[%s] [%s] [%s] _async_update_data returned with %s",
+            self.config_entry.title, self.tier, job_id, data.get(SECTION_UPTIME)
+        )
+        return data
+
+    async def _async_fetch(self, sections, job_id):
+        """Fetch sections, joining the fetches already in flight."""
+        # SMART is queried per disk, the disk list comes along
+        if SECTION_SMART in sections and SECTION_DISK not in sections:
+            sections = [*sections, SECTION_DISK]
+
+        results = await asyncio.gather(
+            *(
+                self._async_fetch_section(section, job_id)
+                for section in sections
+            )
         )
+        return dict(zip(sections, results))
+
+    def _async_fetch_section(self, section, job_id):
+        """Return the fetch of a section, starting one unless in flight."""
+        if (future := self._fetches.get(section)) is None:
+            future = asyncio.ensure_future(
+                self._async_fetch_section_now(section, job_id)
+            )
+            future.add_done_callback(partial(self._fetch_done, section))
+            self._fetches[section] = future
+        # A cancelled refresh must not cancel the fetch of the others
+        return asyncio.shield(future)
+
+    async def _async_fetch_section_now(self, section, job_id):
+        """Fetch a section, averaging sampled ones over the window."""
+        records = await self._async_retrieve_section(section, job_id)
+        if section in self.sampled_sections:
+            records = self.sampler.aggregate(section, records)
+        return records
+
+    def _fetch_done(self, section, future):
+        """Forget the finished fetch, remember when it succeeded."""
+        del self._fetches[section]
+        if future.cancelled():
+            return
+        # Retrieved by the awaiting refreshes, if there are still any
+        if future.exception() is None:
+            self._fetched_at[section] = time.monotonic()
+
+    def _merge(self, fetched):
+        """Return the data with the fetched sections, updating the device."""
+        # Sections nobody listens to keep their last value
+        data = {**(self.data or {}), **fetched}
+
+        self._update_device_names()
+        if SECTION_DISK in fetched:
+            self.device.disk_names = {
+                disk.serial_number: disk.name for disk in fetched[SECTION_DISK]
+            }
+        self._update_index(data)
+        self._restored = False
+        return data
+
+    async def async_refresh_sections(self, sections):
+        """Fetch sections of the tier right away and publish them.
+
+        Sections being fetched are joined and those fetched within
+        REFRESH_MIN_AGE seconds are fresh enough, so bursts of requests
+        and requests overlapping a scheduled refresh fetch each section
+        once.
+        """
+        now = time.monotonic()
+        sections = [
+            section for section in sections
+            if section in self._fetches
+            or now - self._fetched_at.get(section, -math.inf) >= REFRESH_MIN_AGE
+        ]
+        if not sections:
+            return
+
+        if SECTION_SMART in sections and SECTION_SMART not in self._fetches:
+            # Query the disks that are awake even if their result is cached
+            self._smart_cache = {
+                serial: (fetched - self._smart_ttl, passed)
+                for serial, (fetched, passed) in self._smart_cache.items()
+            }
 
-        try:
-            net_result = await self.res_mon.net()
-        except NotConnectedError:
-            await self.api.reconnect()
-            net_result = await self.res_mon.net()
+        job_id = self._generate_job_id()
+        _LOGGER.info(
+            "[%s] [%s] [%s] refreshing %s on request",
+            self.config_entry.title, self.tier, job_id, sections
+        )
+        fetched = await self._async_fetch(sections, job_id)
+        self.async_set_updated_data(self._merge(fetched))
+
+    @property
+    def needs_warm_up(self):
+        """Return True if some data was left out of the first refresh."""
+        return self._restored or any(
+            section not in (self.data or {})
+            for section in TIER_SECTIONS[self.tier]
+        )
 
-        disk_resp = await self._async_retrieve_disk_from_fnos(job_id)
+    def _sections_to_fetch(self):
+        """Return the sections of the tier some entity depends on.
 
-        #print(f"[{job_id}] 系统运行时间信息5:", uptime_result)
-        _LOGGER.warning(
-            "[%s] [%s] _async_update_data returned with %s",
-            self.config_entry.title, job_id, uptime_result
-        )
-        # self.hass.states.async_set(
-        #     f"{DOMAIN}.uptime", uptime_result.get('data').get('uptime')
-        # )
-        return {
-            "uptime": uptime_result.get("data"),
-            "host_name": host_name_resp.get("data"),
-            "cpu": cpu_result.get("data"),
-            "memory": memory_result.get("data"),
-            "net": net_result.get("data"),
-            "store": store_result,
-            "disk": disk_resp,
-        }
+        Entities subscribe with the section they read as context. Before
+        the first refresh there are no entities yet, so all sections but
+        the deferred ones are fetched to build them. Sections never
+        fetched yet come next, and all of them replace a restored snapshot.
+        Passive listeners do not count, but a section only the inventory
+        reads is fetched again after the slow interval to find resources.
+        """
+        sections = TIER_SECTIONS[self.tier]
+        if self.data is None:
+            return [
+                section for section in sections
+                if section not in DEFERRED_SECTIONS
+            ]
+        if self._restored:
+            return list(sections)
+
+        listened = self._active_contexts()
+        now = time.monotonic()
+        return [
+            section for section in sections
+            if section in listened
+            or section not in self.data
+            or (
+                self._passive_contexts[section]
+                and now - self._fetched_at.get(section, -math.inf)
+                >= self._inventory_interval
+            )
+        ]
+
+    def _active_contexts(self):
+        """Return the contexts of the listeners that keep the tier polled."""
+        return set(Counter(self.async_contexts()) - self._passive_contexts)
+
+    async def _async_retrieve_section(self, section, job_id):
+        """Fetch one section of coordinator data."""
+        if section in self._simple_sections:
+            resp = await self._async_call(self._simple_sections[section])
+            return _extract_section(section, resp)
+
+        if section == SECTION_STORE:
+            store_result = await self._async_call(self.stor.general)
+            _LOGGER.warning(
+                "[%s] [%s] _async_update_data got stor.general %s",
+                self.config_entry.title, job_id, store_result
+            )
+            return _extract_section(section, store_result)
+
+        if section == SECTION_DISK_RESMON:
+            resmon_disk_resp = await self._async_call(self.res_mon.disk)
+            _LOGGER.info(
+                "[%s] [%s] _async_update_data got resmon.disk %s",
+                self.config_entry.title, job_id, resmon_disk_resp
+            )
+            return _extract_section(section, resmon_disk_resp)
+
+        if section == SECTION_DISK:
+            return await self._async_retrieve_disk_from_fnos(job_id)
+
+        if section == SECTION_SMART:
+            # Disks in standby are listed by resmon.disk, which is sent
+            # along with the disk list rather than after it
+            disks, resmon_disk_resp = await asyncio.gather(
+                self._async_fetch_section(SECTION_DISK, job_id),
+                self._async_call(self.res_mon.disk),
+            )
+            return await self._async_retrieve_smart_from_fnos(
+                disks, resmon_disk_resp
+            )
+
+        raise ValueError(f"Unknown section {section}")
 
     async def _async_retrieve_disk_from_fnos(self, job_id):
-        try:
-            disk_resp = await self.stor.list_disks()
-        except NotConnectedError:
-            await self.api.reconnect()
-            disk_resp = await self.stor.list_disks()
+        disk_resp = await self._async_call(self.stor.list_disks)
         _LOGGER.info(
             "[%s] [%s] _async_update_data got stor.listDisk %s",
             self.config_entry.title, job_id, disk_resp
         )
 
-        try:
-            resmon_disk_resp = await self.res_mon.disk()
-        except NotConnectedError:
-            await self.api.reconnect()
-            resmon_disk_resp = await self.res_mon.disk()
-        _LOGGER.info(
-            "[%s] [%s] _async_update_data got resmon.disk %s",
-            self.config_entry.title, job_id, resmon_disk_resp
+        return tuple(
+            DiskRecord.from_dict(item) for item in disk_resp.get("disk") or ()
+        )
+
+    async def _async_retrieve_smart_from_fnos(self, disks, resmon_disk_resp):
+        """Fetch SMART health of the disks, skipping those without a result."""
+        standby = {
+            item.get("name")
+            for item in resmon_disk_resp.get("data").get("disk")
+            if item.get("standby")
+        }
+
+        results = await asyncio.gather(
+            *(self._async_retrieve_smart(disk, standby) for disk in disks)
+        )
+
+        # Forget disks that have been removed
+        serials = {disk.serial_number for disk in disks}
+        for serial in self._smart_cache.keys() - serials:
+            del self._smart_cache[serial]
+
+        return tuple(
+            SmartRecord(serial_number=disk.serial_number, passed=passed)
+            for disk, passed in zip(disks, results)
+            if passed is not None
         )
 
-        for item in disk_resp.get("disk"):
-            name = item.get("name")
+    async def _async_retrieve_smart(self, disk, standby):
+        """Return SMART health of a disk, cached when fresh or when it sleeps.
+
+        Querying SMART of a disk in standby would wake it up, so the last
+        known result (or None) is kept instead. A failed query returns
+        None so only the SMART entities of that disk become unavailable.
+        """
+        name = disk.name
+        serial = disk.serial_number
+        cached = self._smart_cache.get(serial)
+        now = time.monotonic()
+
+        if name in standby:
+            _LOGGER.debug("Disk %s is in standby, skip SMART query", name)
+            return cached[1] if cached else None
 
-            resmon = self._find_from_resmon(resmon_disk_resp.get("data").get("disk"), name)
-            item["resmon"] = resmon
+        if cached and now - cached[0] < self._smart_ttl:
+            return cached[1]
 
-            try:
-                smart_resp = await self.stor.get_disk_smart(name)
-            except NotConnectedError:
-                await self.api.reconnect()
-                smart_resp = await self.stor.get_disk_smart(name)
+        try:
+            async with self._smart_semaphore:
+                smart_resp = await self._async_call(
+                    self.stor.get_disk_smart, name
+                )
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            _LOGGER.warning(
+                "[%s] Failed to get SMART of disk %s: %s",
+                self.config_entry.title, name, exc
+            )
+            return None
+
+        passed = smart_status_passed(smart_resp.get("smart"))
+        if passed is None:
+            return None
+        self._smart_cache[serial] = (now, passed)
+        return passed
+
+    @callback
+    def async_restore(self, data, smart_cache):
+        """Start from a persisted snapshot, stale until the first live refresh.
+
+        smart_cache maps serial numbers to (epoch time fetched, passed).
+        """
+        self.data = data
+        self._update_index(data)
+        # Entities are unavailable until live data lands
+        self.last_update_success = False
+        self._restored = True
+        offset = time.monotonic() - time.time()
+        self._smart_cache = {
+            serial: (fetched + offset, passed)
+            for serial, (fetched, passed) in smart_cache.items()
+        }
 
-            item["smart"] = smart_resp.get("smart")
+    def export_smart_cache(self):
+        """Return the SMART cache keyed by serial, with epoch fetch times."""
+        offset = time.time() - time.monotonic()
+        return {
+            serial: (fetched + offset, passed)
+            for serial, (fetched, passed) in self._smart_cache.items()
+        }
 
-        return disk_resp.get("disk")
+    @callback
+    def async_start_sampling(self) -> CALLBACK_TYPE:
+        """Sample the sampled sections between refreshes until cancelled."""
+        return async_track_time_interval(
+            self.hass,
+            self._async_sample,
+            timedelta(seconds=self.sample_interval),
+            name=f"fnOS {self.tier} sampling",
+            cancel_on_shutdown=True,
+        )
+
+    async def _async_sample(self, _):
+        """Add a sample of the sampled sections some entity depends on."""
+        # Skip rather than pile up samples while the NAS is slow
+        if self._sampling or self.data is None or self.suspended:
+            return
+
+        # Inventories only need the refreshes, not the samples
+        listened = self._active_contexts()
+        sections = [
+            section for section in self.sampled_sections
+            if section in listened
+        ]
+        if not sections:
+            return
+
+        self._sampling = True
+        try:
+            results = await asyncio.gather(*(
+                self._async_retrieve_section(section, "sample")
+                for section in sections
+            ))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            # The next refresh reports the failure
+            _LOGGER.debug(
+                "[%s] Failed to sample %s: %s",
+                self.config_entry.title, sections, exc
+            )
+            return
+        finally:
+            self._sampling = False
+
+        for section, records in zip(sections, results):
+            self.sampler.add(section, records)
+
+    def get_sample_range(self, section, field_name, resource=None):
+        """Return (min, max) of a sampled field over the published window."""
+        if self.sampler is None:
+            return None
+        return self.sampler.get_range(section, field_name, resource)
+
+    @callback
+    def async_push_section(self, section, resp):
+        """Apply a section pushed by fnOS without waiting for a poll."""
+        if self.data is None:
+            return
+
+        data = {**self.data, section: _extract_section(section, resp)}
+        self._update_index(data)
+        self.async_set_updated_data(data)
+
+    @callback
+    def async_update_listeners(self):
+        """Notify the listeners of the sections that changed.
+
+        Entities subscribe with their section as context, so an entity
+        only writes its state when a record it reads has changed. All
+        listeners are notified when availability changes, and listeners
+        without a section on every change.
+        """
+        previous = self._notified
+        self._notified = (self.last_update_success, self.data)
+        if previous is None or previous[0] != self.last_update_success:
+            changed = None
+        else:
+            old, new = previous[1] or {}, self.data or {}
+            changed = {
+                section for section in old.keys() | new.keys()
+                if old.get(section) != new.get(section)
+            }
+            if not changed:
+                return
+
+        for update_callback, context in list(self._listeners.values()):
+            if changed is None or context is None or context in changed:
+                update_callback()
+
+    @callback
+    def register_value(self, description):
+        """Extract the value of a sensor description on every refresh."""
+        self._extractors.setdefault(description.section, []).append(
+            (description.key, compile_extractor(description))
+        )
+        self._projections.pop(description.section, None)
+        if self.data is not None:
+            self._project_values(self.data)
+
+    def get_value(self, key, resource=None):
+        """Return the value of a description for a resource, None if missing."""
+        return self._values.get((key, resource))
+
+    def _project_values(self, data):
+        """Evaluate the extractors of the sections that changed, in one pass."""
+        changed = False
+        for section, extractors in self._extractors.items():
+            records = data.get(section)
+            projection = self._projections.get(section)
+            if projection is not None and projection[0] is records:
+                continue
+            changed = True
+            if (attr := _INDEXED_SECTIONS.get(section)) is not None:
+                values = {
+                    (key, getattr(record, attr)): extract(record)
+                    for record in records or ()
+                    for key, extract in extractors
+                }
+            else:
+                values = {
+                    (key, None): extract(records)
+                    for key, extract in extractors
+                }
+            self._projections[section] = (records, values)
+
+        if changed:
+            self._values = {
+                item: value
+                for _, values in self._projections.values()
+                for item, value in values.items()
+            }
+
+    def get_record(self, section, key):
+        """Return the record of a resource in a section, None if it is gone."""
+        return self._index.get(section, {}).get(key)
+
+    @callback
+    def async_add_passive_listener(
+        self, update_callback, context=None
+    ) -> CALLBACK_TYPE:
+        """Listen for updates without keeping the tier polled.
+
+        For bookkeeping such as the snapshot and statistics: polling is
+        suspended while no other listener is left.
+        """
+        remove = self.async_add_listener(update_callback, context)
+        self._passive_contexts[context] += 1
+        removed = False
+
+        @callback
+        def _remove() -> None:
+            nonlocal removed
+            if removed:
+                return
+            removed = True
+            self._passive_contexts[context] -= 1
+            remove()
+
+        return _remove
+
+    @property
+    def suspended(self) -> bool:
+        """Return True while no entity needs the data of the tier."""
+        return len(self._listeners) <= self._passive_contexts.total()
+
+    def get_resources(self, section):
+        """Return the keys of the resources of a section, None until fetched."""
+        if self.data is None or self.data.get(section) is None:
+            return None
+        return self._index[section].keys()
+
+    @callback
+    def async_add_inventory_listener(
+        self, section, update_callback
+    ) -> CALLBACK_TYPE:
+        """Listen for resources appearing in or leaving a section.
+
+        update_callback(added, removed) gets the records of the new
+        resources by key and the keys of those gone, whenever the section
+        changes. Both come from one diff of the keys of the previous call
+        and the current ones, so a resource gone and back between two
+        calls is neither removed nor added.
+        The first call, once the section is fetched, lists all resources.
+        While the tier is polled, the listener alone has the section
+        fetched again once per slow interval.
+        """
+        previous = frozenset()
+
+        @callback
+        def _async_diff_inventory() -> None:
+            nonlocal previous
+            if (resources := self.get_resources(section)) is None:
+                return
+            current = frozenset(resources)
+            if current == previous:
+                return
+            index = self._index[section]
+            added = {key: index[key] for key in current - previous}
+            removed = list(previous - current)
+            previous = current
+            update_callback(added, removed)
+
+        # New resources are only looked for while the tier is polled
+        remove = self.async_add_passive_listener(_async_diff_inventory, section)
+        _async_diff_inventory()
+        return remove
+
+    def _update_index(self, data):
+        """Index the resources of each section by their key, project values."""
+        self._index = {
+            section: {
+                getattr(record, key): record
+                for record in data.get(section) or ()
+            }
+            for section, key in _INDEXED_SECTIONS.items()
+        }
+        self._project_values(data)
+
+    def _update_device_names(self):
+        """Keep the shared device names in sync with the client.
+
+        FnosClient asks getHostName itself on every connect and keeps the
+        answer. Asking again is not reliable: some fnos versions take the
+        answer for the one of their own request and the call times out.
+        """
+        if self.api.host_name is not None:
+            self.device.host_name = self.api.host_name
+            self.device.trim_version = self.api.trim_version
 
-    def _find_from_resmon(self, resmon_disks, name):
-        for item in resmon_disks:
-            if item.get("name") == name:
-                return item
-        
-        return None
\ No newline at end of file
+    async def _async_call(self, method, *args):
+        """Call a fnOS API method through the shared connection."""
+        return await self.connection.async_call(method, *args)
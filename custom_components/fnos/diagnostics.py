@@ -0,0 +1,138 @@
+"""Diagnostics support for fnOS."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from . import FnosConfigEntry
+from .const import (
+    CONF_DEVICE_TOKEN,
+    SECTION_DISK,
+    SECTION_NET,
+    SECTION_STORE,
+    SECTION_TIERS,
+)
+from .sensor import NETWORK_IFS_SENSORS, STORAGE_DISK_SENSORS, STORAGE_VOL_SENSORS
+from .stats import payload_size
+
+TO_REDACT = {
+    CONF_DEVICE_TOKEN,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    "hostName",
+    "machineId",
+    "serialNumber",
+    "serial_number",
+    "storUuid",
+    "uuid",
+    "wwn",
+}
+
+# Resource type -> section listing the resources and their sensor keys
+_RESOURCES = {
+    "volumes": (SECTION_STORE, STORAGE_VOL_SENSORS),
+    "disks": (SECTION_DISK, STORAGE_DISK_SENSORS),
+    "interfaces": (SECTION_NET, NETWORK_IFS_SENSORS),
+}
+
+
+def _timestamp(value: float | None) -> str | None:
+    """Return an epoch timestamp as ISO 8601."""
+    if value is None:
+        return None
+    return dt_util.utc_from_timestamp(value).isoformat()
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: FnosConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = entry.runtime_data
+    connection = data.connection
+    stats = connection.stats
+
+    registry_entries = er.async_entries_for_config_entry(
+        er.async_get(hass), entry.entry_id
+    )
+    resources = {}
+    for resource, (section, descriptions) in _RESOURCES.items():
+        coordinator = data.coordinators[SECTION_TIERS[section]]
+        records = coordinator.data.get(section) or ()
+        keys = tuple(f"_{description.key}" for description in descriptions)
+        entities = [
+            entity for entity in registry_entries
+            if entity.unique_id.endswith(keys)
+        ]
+        resources[resource] = {
+            "count": len(records),
+            "entities": len(entities),
+            "entities_enabled": sum(
+                1 for entity in entities if not entity.disabled
+            ),
+        }
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": {
+            "connected": connection.api.connected,
+            "circuit_open": connection.circuit_open,
+        },
+        "coordinators": {
+            tier: {
+                "interval": coordinator.interval.total_seconds(),
+                "suspended": coordinator.suspended,
+                "last_update_success": coordinator.last_update_success,
+                "sections": sorted(coordinator.data or ()),
+            }
+            for tier, coordinator in data.coordinators.items()
+        },
+        "resources": resources,
+        "entities": len(registry_entries),
+        "endpoints": {
+            group: {
+                "calls": endpoint.calls,
+                "failures": endpoint.failures,
+                "latency_last_ms": endpoint.last,
+                "latency_avg_ms": endpoint.avg,
+                "latency_p95_ms": endpoint.p95,
+                "last_payload_size": endpoint.last_size,
+            }
+            for group, endpoint in stats.endpoints.items()
+        },
+        "refresh_cycles": [
+            {
+                "tier": cycle.tier,
+                "start": _timestamp(cycle.start),
+                "end": _timestamp(cycle.end),
+                "error": cycle.error,
+                "calls": [
+                    {
+                        **asdict(call),
+                        "start": _timestamp(call.start),
+                        "end": _timestamp(call.end),
+                    }
+                    for call in cycle.calls
+                ],
+            }
+            for cycle in stats.cycles
+        ],
+        "reconnects": [
+            {**event, "time": _timestamp(event["time"])}
+            for event in stats.reconnect_events
+        ],
+        # The last response of each call, as the refreshes left them; a
+        # download must not make the NAS do any work
+        "samples": async_redact_data(stats.samples, TO_REDACT),
+        "sample_sizes": {
+            name: payload_size(resp) for name, resp in stats.samples.items()
+        },
+    }
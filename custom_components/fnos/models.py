@@ -0,0 +1,159 @@
+"""Compact snapshot records of fnOS data.
+
+Only the fields read by the sensors are kept, the raw responses are
+dropped once a record has been built from them.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class CpuRecord:
+    """CPU utilisation, load and temperature."""
+
+    busy_all: float | None
+    busy_user: float | None
+    busy_system: float | None
+    busy_other: float | None
+    load_1min: float | None
+    load_5min: float | None
+    load_15min: float | None
+    temp: float | None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CpuRecord:
+        """Build from appcgi.resmon.cpu data."""
+        cpu = data.get("cpu") or {}
+        busy = cpu.get("busy") or {}
+        loadavg = cpu.get("loadavg") or {}
+        temp = cpu.get("temp") or [None]
+        return cls(
+            busy_all=busy.get("all"),
+            busy_user=busy.get("user"),
+            busy_system=busy.get("system"),
+            busy_other=busy.get("other"),
+            load_1min=loadavg.get("avg1min"),
+            load_5min=loadavg.get("avg5min"),
+            load_15min=loadavg.get("avg15min"),
+            temp=temp[0],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class MemoryRecord:
+    """Memory and swap usage in bytes."""
+
+    mem_total: int | None
+    mem_used: int | None
+    mem_free: int | None
+    mem_cached: int | None
+    swap_total: int | None
+    swap_free: int | None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> MemoryRecord:
+        """Build from appcgi.resmon.mem data."""
+        mem = data.get("mem") or {}
+        swap = data.get("swap") or {}
+        return cls(
+            mem_total=mem.get("total"),
+            mem_used=mem.get("used"),
+            mem_free=mem.get("free"),
+            mem_cached=mem.get("cached"),
+            swap_total=swap.get("total"),
+            swap_free=swap.get("free"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class InterfaceRecord:
+    """Throughput of a network interface in bytes per second."""
+
+    name: str
+    transmit: int | None
+    receive: int | None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> InterfaceRecord:
+        """Build from an item of appcgi.resmon.net ifs."""
+        return cls(
+            name=data.get("name"),
+            transmit=data.get("transmit"),
+            receive=data.get("receive"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class VolumeRecord:
+    """Size of a storage volume in bytes."""
+
+    name: str
+    uuid: str
+    fssize: int | None
+    frsize: int | None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> VolumeRecord:
+        """Build from an item of stor.general array."""
+        return cls(
+            name=data.get("name"),
+            uuid=data.get("uuid"),
+            fssize=data.get("fssize"),
+            frsize=data.get("frsize"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DiskResmonRecord:
+    """Activity of a disk, as monitored by resmon."""
+
+    name: str
+    temp: float | None
+    standby: bool
+    busy: float | None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DiskResmonRecord:
+        """Build from an item of appcgi.resmon.disk disk."""
+        return cls(
+            name=data.get("name"),
+            temp=data.get("temp"),
+            standby=bool(data.get("standby")),
+            busy=data.get("busy"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class DiskRecord:
+    """A physical disk."""
+
+    name: str
+    serial_number: str
+    model_name: str | None
+    vendor: str | None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> DiskRecord:
+        """Build from an item of stor.listDisk disk."""
+        return cls(
+            name=data.get("name"),
+            serial_number=data.get("serialNumber"),
+            model_name=data.get("modelName"),
+            vendor=data.get("vendor"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class SmartRecord:
+    """SMART health of a disk."""
+
+    serial_number: str
+    passed: bool
+
+
+def smart_status_passed(smart: dict | None) -> bool | None:
+    """Return the overall result of a stor.diskSmart response."""
+    if not smart:
+        return None
+    return (smart.get("smart_status") or {}).get("passed")
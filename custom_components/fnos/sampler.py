@@ -0,0 +1,146 @@
+"""Sampling of fast changing fnOS values between refreshes."""
+from __future__ import annotations
+
+from array import array
+from dataclasses import replace
+
+from .const import SECTION_CPU, SECTION_NET
+
+# Fields sampled per section, records of the other fields are published as is
+SAMPLED_FIELDS = {
+    SECTION_CPU: ("busy_all", "busy_user", "busy_system", "busy_other"),
+    SECTION_NET: ("transmit", "receive"),
+}
+
+
+class RingBuffer:
+    """The last samples of a value, in a fixed size array of doubles."""
+
+    __slots__ = ("_values", "_next", "_count")
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty buffer."""
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the buffer."""
+        return self._count
+
+    def append(self, value: float) -> None:
+        """Add a sample, replacing the oldest once the buffer is full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._values)
+        if self._count < len(self._values):
+            self._count += 1
+
+    def resized(self, size: int) -> RingBuffer:
+        """Return a buffer of the given size with the latest samples."""
+        if self._count == len(self._values):
+            # Once full, the oldest sample is the one to be replaced next
+            ordered = self._values[self._next:] + self._values[: self._next]
+        else:
+            ordered = self._values[: self._count]
+        buffer = RingBuffer(size)
+        for value in ordered[-size:]:
+            buffer.append(value)
+        return buffer
+
+    def _window(self):
+        """Return the samples, in no particular order."""
+        if self._count == len(self._values):
+            return self._values
+        # Until the buffer wraps, samples fill it from the start
+        return self._values[: self._count]
+
+    def mean(self) -> float:
+        """Return the mean of the samples."""
+        return sum(self._window()) / self._count
+
+    def min(self) -> float:
+        """Return the smallest sample."""
+        return min(self._window())
+
+    def max(self) -> float:
+        """Return the largest sample."""
+        return max(self._window())
+
+
+class FnosSampler:
+    """Ring buffers of the sampled fields of a tier.
+
+    Samples taken between refreshes are added as they come, each refresh
+    adds its own and publishes the mean over the window instead of the
+    instantaneous value, so short bursts are not missed.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize the sampler, keeping the last size samples."""
+        self.size = size
+        # (section, resource, field) -> samples; resource is None for
+        # sections with a single record
+        self._buffers: dict[tuple, RingBuffer] = {}
+        # (section, resource, field) -> (min, max) of the published window
+        self._ranges: dict[tuple, tuple[float, float]] = {}
+
+    def add(self, section, records) -> None:
+        """Add the values of a sampled section."""
+        fields = SAMPLED_FIELDS[section]
+        for resource, record in _resources(records):
+            for field in fields:
+                if (value := getattr(record, field)) is None:
+                    continue
+                key = (section, resource, field)
+                if (buffer := self._buffers.get(key)) is None:
+                    buffer = self._buffers[key] = RingBuffer(self.size)
+                buffer.append(value)
+
+    def resize(self, size: int) -> None:
+        """Keep the last size samples from now on, as the window changes."""
+        if size == self.size:
+            return
+        self.size = size
+        self._buffers = {
+            key: buffer.resized(size) for key, buffer in self._buffers.items()
+        }
+
+    def aggregate(self, section, records):
+        """Add the values of a refresh, return them averaged over the window."""
+        self.add(section, records)
+        resources = dict(_resources(records))
+
+        # Forget resources that are gone, such as removed interfaces
+        for key in [key for key in self._buffers if key[0] == section]:
+            if key[1] not in resources:
+                del self._buffers[key]
+                self._ranges.pop(key, None)
+
+        averaged = {}
+        for resource, record in resources.items():
+            means = {}
+            for field in SAMPLED_FIELDS[section]:
+                key = (section, resource, field)
+                buffer = self._buffers.get(key)
+                if not buffer:
+                    continue
+                means[field] = round(buffer.mean(), 2)
+                self._ranges[key] = (buffer.min(), buffer.max())
+            averaged[resource] = replace(record, **means)
+
+        if isinstance(records, tuple):
+            return tuple(averaged.values())
+        return averaged[None]
+
+    def get_range(self, section, field_name, resource=None):
+        """Return (min, max) of a field over the published window, if any."""
+        return self._ranges.get((section, resource, field_name))
+
+
+def _resources(records):
+    """Yield (resource, record) of a section, keyed by name when a list."""
+    if isinstance(records, tuple):
+        for record in records:
+            yield record.name, record
+    else:
+        yield None, records
@@ -0,0 +1,96 @@
+"""Refresh scheduling shared by all fnOS config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from functools import partial
+import math
+import time
+import zlib
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, FLEET_CONCURRENCY
+
+_DATA_SCHEDULER = "scheduler"
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> FnosFleetScheduler:
+    """Return the scheduler of the instance, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    if (scheduler := data.get(_DATA_SCHEDULER)) is None:
+        scheduler = data[_DATA_SCHEDULER] = FnosFleetScheduler(hass)
+    return scheduler
+
+
+class FnosFleetScheduler:
+    """Spread the refreshes of all fnOS coordinators over their interval.
+
+    Each coordinator refreshes at a fixed offset within its interval,
+    derived from its entry and tier, so several NAS set up at the same
+    time do not refresh in lockstep, and keep their slots over restarts.
+    At most FLEET_CONCURRENCY refreshes of each tier run at a time, so
+    slow tiers waiting on SMART never hold up the fast ones. Tiers no
+    entity listens to are skipped until one does.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the scheduler."""
+        self.hass = hass
+        # tier -> semaphore limiting its concurrent refreshes
+        self._semaphores = defaultdict(
+            partial(asyncio.Semaphore, FLEET_CONCURRENCY)
+        )
+        # coordinator -> cancel of its next refresh
+        self._scheduled: dict = {}
+
+    @callback
+    def async_register(self, coordinator) -> CALLBACK_TYPE:
+        """Refresh a coordinator in its slot until the returned callback."""
+        self._schedule(coordinator)
+
+        @callback
+        def _unregister() -> None:
+            if (cancel := self._scheduled.pop(coordinator, None)) is not None:
+                cancel()
+
+        return _unregister
+
+    @staticmethod
+    def slot_offset(coordinator) -> float:
+        """Return the offset of a coordinator in its interval, in seconds."""
+        key = f"{coordinator.config_entry.entry_id}_{coordinator.tier}"
+        interval = coordinator.interval.total_seconds()
+        return zlib.crc32(key.encode()) / 0x100000000 * interval
+
+    @callback
+    def _schedule(self, coordinator) -> None:
+        """Schedule the next refresh of a coordinator in its slot."""
+        interval = coordinator.interval.total_seconds()
+        offset = self.slot_offset(coordinator)
+        now = time.time()
+        # Slots are aligned to the epoch, so they survive restarts
+        slot = math.floor((now - offset) / interval) + 1
+        next_refresh = slot * interval + offset
+        self._scheduled[coordinator] = async_call_later(
+            self.hass,
+            next_refresh - now,
+            HassJob(
+                partial(self._async_refresh, coordinator),
+                f"fnOS {coordinator.tier} refresh",
+                cancel_on_shutdown=True,
+            ),
+        )
+
+    async def _async_refresh(self, coordinator, _) -> None:
+        """Refresh a coordinator, then schedule its next slot."""
+        try:
+            async with self._semaphores[coordinator.tier]:
+                if coordinator in self._scheduled and not coordinator.suspended:
+                    await coordinator.async_refresh()
+        finally:
+            # Unless it was unregistered meanwhile
+            if coordinator in self._scheduled:
+                self._schedule(coordinator)
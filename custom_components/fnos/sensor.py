@@ -1,7 +1,9 @@
 """fnOS sensor platform."""
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
 from dataclasses import dataclass
 
@@ -21,7 +23,7 @@ from homeassistant.const import (
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -31,88 +33,133 @@ from .const import (
     CONF_NETWORK_IFS,
     CONF_VOLUMES, 
     DOMAIN,
+    ENDPOINT_GROUPS,
     ENTITY_UNIT_LOAD,
+    SECTION_CPU,
+    SECTION_DISK,
+    SECTION_DISK_RESMON,
+    SECTION_MEMORY,
+    SECTION_NET,
+    SECTION_SMART,
+    SECTION_STORE,
+    SECTION_TIERS,
+    SECTION_UPTIME,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SLOW,
 )
 from . import FnosData
 from .coordinator import FnosCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Attributes of sampled sensors
+ATTR_MIN = "min"
+ATTR_MAX = "max"
+
 
 @dataclass(frozen=True, kw_only=True)
 class FnosSensorEntityDescription(SensorEntityDescription):
     """Describes F&OS sensor entity."""
 
+    section: str
+    # The value is the field of the section record (or of the resource
+    # record, for sections listing resources) or derived from the record
+    # by value_fn. The coordinator extracts it once per refresh.
+    field: str | None = None
+    value_fn: callable | None = None
+    # State is only written when the value moves by more than the
+    # absolute deadband or the relative one (fraction of the last written
+    # value), or max_silence seconds after the last write
+    deadband: float | None = None
+    deadband_relative: float | None = None
+    max_silence: int | None = None
+
+
+@dataclass(frozen=True, kw_only=True)
+class FnosStatsSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor of the fnOS API call statistics."""
+
     value_fn: callable
+    # Payload sizes are only measured while such a sensor is enabled
+    measures_size: bool = False
 
 
 UTILISATION_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_other_load",
+        section=SECTION_CPU,
         translation_key="cpu_other_load",
         native_unit_of_measurement=PERCENTAGE,
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("busy").get("other"),
+        field="busy_other",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_user_load",
+        section=SECTION_CPU,
         translation_key="cpu_user_load",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("busy").get("user"),
+        field="busy_user",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_system_load",
+        section=SECTION_CPU,
         translation_key="cpu_system_load",
         native_unit_of_measurement=PERCENTAGE,
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("busy").get("system"),
+        field="busy_system",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_total_load",
+        section=SECTION_CPU,
         translation_key="cpu_total_load",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("busy").get("all"),
+        field="busy_all",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_1min_load",
+        section=SECTION_CPU,
         translation_key="cpu_1min_load",
         native_unit_of_measurement=ENTITY_UNIT_LOAD,
         suggested_display_precision=2,
         entity_registry_enabled_default=False,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("loadavg").get("avg1min"),
+        field="load_1min",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_5min_load",
+        section=SECTION_CPU,
         translation_key="cpu_5min_load",
         native_unit_of_measurement=ENTITY_UNIT_LOAD,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("loadavg").get("avg5min"),
+        field="load_5min",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_15min_load",
+        section=SECTION_CPU,
         translation_key="cpu_15min_load",
         native_unit_of_measurement=ENTITY_UNIT_LOAD,
         suggested_display_precision=2,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("loadavg").get("avg15min"),
+        field="load_15min",
     ),
 
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_real_usage",
+        section=SECTION_MEMORY,
         translation_key="memory_real_usage",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         suggested_display_precision=2,
-        value_fn=lambda data: (
-            data.get("memory").get("mem").get("used") /
-            data.get("memory").get("mem").get("total") * 100.0
-        ),
+        value_fn=lambda memory: memory.mem_used / memory.mem_total * 100.0,
+        deadband=0.5,
+        max_silence=900,
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_size",
+        section=SECTION_MEMORY,
         translation_key="memory_size",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
@@ -120,13 +167,11 @@ UTILISATION_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.DATA_SIZE,
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: (
-            data.get("memory").get("mem").get("total") +
-            data.get("memory").get("swap").get("total")
-        )
+        value_fn=lambda memory: memory.mem_total + memory.swap_total,
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_cached",
+        section=SECTION_MEMORY,
         translation_key="memory_cached",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
@@ -134,161 +179,249 @@ UTILISATION_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.DATA_SIZE,
         entity_registry_enabled_default=False,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("memory").get("mem").get("cached"),
+        field="mem_cached",
+        deadband_relative=0.01,
+        max_silence=900,
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_available_swap",
+        section=SECTION_MEMORY,
         translation_key="memory_available_swap",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("memory").get("swap").get("free"),
+        field="swap_free",
+        deadband_relative=0.01,
+        max_silence=900,
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_available_real",
+        section=SECTION_MEMORY,
         translation_key="memory_available_real",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("memory").get("mem").get("free"),
+        field="mem_free",
+        deadband_relative=0.01,
+        max_silence=900,
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_total_swap",
+        section=SECTION_MEMORY,
         translation_key="memory_total_swap",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("memory").get("swap").get("total"),
+        field="swap_total",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="memory_total_real",
+        section=SECTION_MEMORY,
         translation_key="memory_total_real",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.MEGABYTES,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("memory").get("mem").get("total"),
+        field="mem_total",
     ),
 )
 
 STORAGE_VOL_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="volume_size_used",
+        section=SECTION_STORE,
         translation_key="volume_size_used",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.TERABYTES,
         suggested_display_precision=2,
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("fssize") - data.get("frsize")
+        value_fn=lambda volume: volume.fssize - volume.frsize,
+        deadband_relative=0.001,
+        max_silence=3600,
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="volume_size_total",
+        section=SECTION_STORE,
         translation_key="volume_size_total",
         native_unit_of_measurement=UnitOfInformation.BYTES,
         suggested_unit_of_measurement=UnitOfInformation.TERABYTES,
         suggested_display_precision=2,
         device_class=SensorDeviceClass.DATA_SIZE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("fssize")
+        field="fssize",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="volume_percentage_used",
+        section=SECTION_STORE,
         translation_key="volume_percentage_used",
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=2,
-        value_fn=lambda data: (
-            (data["fssize"] - data["frsize"]) / data["fssize"] * 100.0
-        )
+        value_fn=lambda volume: (
+            (volume.fssize - volume.frsize) / volume.fssize * 100.0
+        ),
+        deadband=0.1,
+        max_silence=3600,
     ),
 )
 
 NETWORK_IFS_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="network_up",
+        section=SECTION_NET,
         translation_key="network_up",
         native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
         suggested_unit_of_measurement=UnitOfDataRate.KILOBYTES_PER_SECOND,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.DATA_RATE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("transmit"),
+        field="transmit",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="network_down",
+        section=SECTION_NET,
         translation_key="network_down",
         native_unit_of_measurement=UnitOfDataRate.BYTES_PER_SECOND,
         suggested_unit_of_measurement=UnitOfDataRate.KILOBYTES_PER_SECOND,
         suggested_display_precision=1,
         device_class=SensorDeviceClass.DATA_RATE,
         state_class=SensorStateClass.MEASUREMENT,
-        value_fn=lambda data: data.get("receive"),
+        field="receive",
     ),
 )
 
 STORAGE_DISK_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="disk_smart_status",
+        section=SECTION_SMART,
         translation_key="disk_smart_status",
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: (
-            "Healty" if data.get("smart").get("smart_status").get("passed") else "Unhealty"
-        )
+        value_fn=lambda smart: "Healty" if smart.passed else "Unhealty",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="disk_temp",
+        section=SECTION_DISK_RESMON,
         translation_key="disk_temp",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: (
-            data.get("resmon").get("temp")
-        )
+        field="temp",
+        deadband=1,
+        max_silence=1800,
     ),
 )
 
 INFORMATION_SENSORS: tuple[FnosSensorEntityDescription, ...] = (
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="temperature",
+        section=SECTION_CPU,
         translation_key="temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         device_class=SensorDeviceClass.TEMPERATURE,
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("temp")[0],
+        field="temp",
     ),
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="uptime",
+        section=SECTION_UPTIME,
         translation_key="uptime",
         native_unit_of_measurement=UnitOfTime.SECONDS,
         device_class=SensorDeviceClass.DURATION,
         entity_registry_enabled_default=False,
         entity_category=EntityCategory.DIAGNOSTIC,
-        value_fn=lambda data: data.get("uptime").get("uptime"),
+        value_fn=lambda uptime: uptime,
     ),
 )
 
 HWSENSORS: tuple[FnosSensorEntityDescription, ...] = (
     FnosSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
         key="cpu_temperature",
+        section=SECTION_CPU,
         translation_key="cpu_temperature",
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         state_class=SensorStateClass.MEASUREMENT,
         device_class=SensorDeviceClass.TEMPERATURE,
-        value_fn=lambda data: data.get("cpu").get("cpu").get("temp")[0],
+        field="temp",
+    ),
+)
+
+def _latency_sensors(group):
+    """Describe the latency sensors of an endpoint group."""
+    return tuple(
+        FnosStatsSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
+            key=f"{group}_latency_{stat}",
+            translation_key=f"{group}_latency_{stat}",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+            entity_registry_enabled_default=False,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda stats, stat=stat: getattr(
+                stats.endpoint(group), stat
+            ),
+        )
+        for stat in ("last", "avg", "p95")
+    ) + (
+        FnosStatsSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
+            key=f"{group}_payload_size",
+            translation_key=f"{group}_payload_size",
+            native_unit_of_measurement=UnitOfInformation.BYTES,
+            device_class=SensorDeviceClass.DATA_SIZE,
+            entity_registry_enabled_default=False,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda stats: stats.endpoint(group).last_size,
+            measures_size=True,
+        ),
+    )
+
+
+STATS_SENSORS: tuple[FnosStatsSensorEntityDescription, ...] = (
+    *(
+        sensor
+        for group in ENDPOINT_GROUPS
+        for sensor in _latency_sensors(group)
+    ),
+    *(
+        FnosStatsSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
+            key=f"{tier}_refresh_duration",
+            translation_key=f"{tier}_refresh_duration",
+            native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+            device_class=SensorDeviceClass.DURATION,
+            state_class=SensorStateClass.MEASUREMENT,
+            suggested_display_precision=0,
+            entity_category=EntityCategory.DIAGNOSTIC,
+            value_fn=lambda stats, tier=tier: stats.refresh_durations.get(tier),
+        )
+        for tier in (TIER_FAST, TIER_MEDIUM, TIER_SLOW)
+    ),
+    FnosStatsSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
+        key="reconnects",
+        translation_key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.reconnects,
+    ),
+    FnosStatsSensorEntityDescription(  # pylint: disable=unexpected-keyword-arg
+        key="failed_calls",
+        translation_key="failed_calls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda stats: stats.failed_calls,
     ),
 )
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # pylint: disable=unused-argument
+    hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
@@ -296,66 +429,261 @@ async def async_setup_entry(
     _LOGGER.warning("[%s] sensor.async_setup_entry called", entry.title)
 
     data: FnosData = entry.runtime_data
-    coordinator = data.coordinator
+    coordinators = data.coordinators
+
+    def coordinator_for(description):
+        """Return the coordinator of the tier the description belongs to."""
+        return coordinators[SECTION_TIERS[description.section]]
+
+    # Values are extracted by the coordinators once per refresh
+    for description in (
+        *UTILISATION_SENSORS,
+        *INFORMATION_SENSORS,
+        *HWSENSORS,
+        *STORAGE_VOL_SENSORS,
+        *STORAGE_DISK_SENSORS,
+        *NETWORK_IFS_SENSORS,
+    ):
+        coordinator_for(description).register_value(description)
 
     entities = [
-        FnosSensorEntity(coordinator, description)
+        FnosSensorEntity(coordinator_for(description), description)
         for description in UTILISATION_SENSORS
     ]
     entities.extend([
-        FnosSensorEntity(coordinator, description)
+        FnosSensorEntity(coordinator_for(description), description)
         for description in INFORMATION_SENSORS
     ])
     entities.extend([
-        FnosSensorEntity(coordinator, description)
+        FnosSensorEntity(coordinator_for(description), description)
         for description in HWSENSORS
     ])
 
-    # Handle all volumes
-    if coordinator.data.get("store").get("array"):
-        entities.extend(
-            [
-                FnosVolumeSensorEntity(coordinator, description, volume)
-                for volume in entry.data.get(
-                    CONF_VOLUMES,
-                    coordinator.data.get("store").get("array")
-                )
-                for description in STORAGE_VOL_SENSORS
-            ]
+    # Entities of the resources fetched before setup join the others
+    add_entities = entities.extend
+
+    def track_resources(coordinator, section, configured, create):
+        """Keep the entities of the resources of a section.
+
+        Entities are added when their resource is first fetched, which
+        for deferred sections is after setup, and when a disk is inserted
+        or a volume or interface created later on. Entities of resources
+        that are gone are removed; their registry entries stay, so they
+        come back with their settings if the resource returns. Resources
+        listed in the entry data are the only ones tracked, the same way.
+        """
+        created = {}
+        # key -> task removing the entities of a resource that is gone
+        removing = {}
+
+        async def _async_remove(key, gone):
+            try:
+                for entity in gone:
+                    await entity.async_remove()
+            finally:
+                if removing.get(key) is asyncio.current_task():
+                    del removing[key]
+
+        async def _async_add_after(key, removal, new_entities):
+            # The new entities have the unique ids of those being removed
+            await asyncio.shield(removal)
+            # Unless the resource is gone again meanwhile
+            if created.get(key) is new_entities:
+                add_entities(new_entities)
+
+        @callback
+        def _async_inventory_changed(added, removed):
+            for key in removed:
+                _LOGGER.info("[%s] %s %s is gone", entry.title, section, key)
+                gone = [
+                    entity for entity in created.pop(key, ())
+                    if entity.hass is not None
+                ]
+                if gone:
+                    removing[key] = entry.async_create_task(
+                        hass, _async_remove(key, gone)
+                    )
+
+            new_entities = []
+            for key, record in added.items():
+                if configured is not None and key not in configured:
+                    continue
+                created[key] = create(record)
+                if (removal := removing.get(key)) is not None:
+                    entry.async_create_task(
+                        hass, _async_add_after(key, removal, created[key])
+                    )
+                else:
+                    new_entities.extend(created[key])
+            if new_entities:
+                add_entities(new_entities)
+
+        entry.async_on_unload(
+            coordinator.async_add_inventory_listener(
+                section, _async_inventory_changed
+            )
         )
 
+    # Handle all volumes
+    track_resources(
+        coordinators[TIER_MEDIUM],
+        SECTION_STORE,
+        _configured_keys(entry.data.get(CONF_VOLUMES), "uuid"),
+        lambda volume: [
+            FnosVolumeSensorEntity(
+                coordinator_for(description), description, volume
+            )
+            for description in STORAGE_VOL_SENSORS
+        ],
+    )
+
     # Handle all disks
-    if coordinator.data.get("disk"):
-        entities.extend(
-            [
-                FnosDiskSensorEntity(coordinator, description, disk)
-                for disk in entry.data.get(
-                    CONF_DISKS, coordinator.data.get("disk")
-                )
-                for description in STORAGE_DISK_SENSORS
-            ]
-        )
+    track_resources(
+        coordinators[TIER_SLOW],
+        SECTION_DISK,
+        _configured_keys(entry.data.get(CONF_DISKS), "serialNumber"),
+        lambda disk: [
+            FnosDiskSensorEntity(
+                coordinator_for(description), description, disk,
+                coordinators[TIER_SLOW]
+            )
+            for description in STORAGE_DISK_SENSORS
+        ],
+    )
 
     # Handle all network ifs
-    if coordinator.data.get("net").get("ifs"):
-        entities.extend(
-            [
-                FnosNetworkIfsSensorEntity(coordinator, description, ifs)
-                for ifs in entry.data.get(
-                    CONF_NETWORK_IFS, coordinator.data.get("net").get("ifs")
-                )
-                for description in NETWORK_IFS_SENSORS
-            ]
-        )
+    track_resources(
+        coordinators[TIER_FAST],
+        SECTION_NET,
+        _configured_keys(entry.data.get(CONF_NETWORK_IFS), "name"),
+        lambda ifs: [
+            FnosNetworkIfsSensorEntity(
+                coordinator_for(description), description, ifs
+            )
+            for description in NETWORK_IFS_SENSORS
+        ],
+    )
+
+    entities.extend(
+        [
+            FnosStatsSensorEntity(data, description)
+            for description in STATS_SENSORS
+        ]
+    )
 
     async_add_entities(entities)
+    add_entities = async_add_entities
+
+
+def _configured_keys(configured, key):
+    """Return the keys of the resources listed in the entry data, if any.
+
+    They are listed by key, or as the fnOS items such as stor.general arrays.
+    """
+    if configured is None:
+        return None
+    return {
+        item.get(key) if isinstance(item, dict) else item
+        for item in configured
+    }
+
+
+def _sample_attributes(coordinator, description, resource=None):
+    """Return min and max of a sampled value over the published window."""
+    if description.field is None:
+        return None
+    sample_range = coordinator.get_sample_range(
+        description.section, description.field, resource
+    )
+    if sample_range is None:
+        return None
+    return {ATTR_MIN: sample_range[0], ATTR_MAX: sample_range[1]}
+
+
+class FnosCoordinatorSensorEntity(
+    CoordinatorEntity[FnosCoordinator], SensorEntity
+):
+    """Base of the fnOS sensors fed by a coordinator.
+
+    Applies the deadband of the description: updates within the band of
+    the last written value are dropped until max_silence expires, so a
+    value jittering by tiny amounts does not add a recorder row per cycle.
+    """
 
+    entity_description: FnosSensorEntityDescription
+    # (available, native_value) and monotonic time of the last write
+    _written: tuple[bool, StateType] | None = None
+    _written_at: float = 0.0
+
+    @property
+    def resource(self):
+        """Return the key of the resource of the sensor, None for the device."""
+        return None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.coordinator.get_value(
+            self.entity_description.key, self.resource
+        )
 
-class FnosSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return (
+            self.coordinator.last_update_success
+            and self.native_value is not None
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state unless the value stayed within the deadband."""
+        if not self._within_deadband():
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, remembering it for the deadband."""
+        self._written = (self.available, self.native_value)
+        self._written_at = time.monotonic()
+        super().async_write_ha_state()
+
+    def _within_deadband(self) -> bool:
+        """Return True if the state need not be written."""
+        description = self.entity_description
+        if self._written is None or (
+            description.deadband is None
+            and description.deadband_relative is None
+        ):
+            return False
+
+        available, value = self.available, self.native_value
+        last_available, last_value = self._written
+        if (
+            available != last_available
+            or not isinstance(value, (int, float))
+            or not isinstance(last_value, (int, float))
+        ):
+            return False
+        if (
+            description.max_silence is not None
+            and time.monotonic() - self._written_at >= description.max_silence
+        ):
+            return False
+
+        band = max(
+            description.deadband or 0,
+            (description.deadband_relative or 0) * abs(last_value),
+        )
+        return abs(value - last_value) <= band
+
+
+class FnosSensorEntity(FnosCoordinatorSensorEntity):
     """Representation of a fnOS sensor."""
 
     entity_description: FnosSensorEntityDescription
     _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({ATTR_MIN, ATTR_MAX})
 
     def __init__(
         self,
@@ -363,7 +691,7 @@ class FnosSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
         description: FnosSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.section)
         self.entity_description = description
         self._attr_unique_id = (
             f"{coordinator.machine_id}_{description.key}"
@@ -371,17 +699,12 @@ class FnosSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
         self._attr_device_info = coordinator.device_info
 
     @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        return self.entity_description.value_fn(self.coordinator.data)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    def extra_state_attributes(self):
+        """Return the range of the value when sampled."""
+        return _sample_attributes(self.coordinator, self.entity_description)
 
 
-class FnosVolumeSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
+class FnosVolumeSensorEntity(FnosCoordinatorSensorEntity):
     """Representation of a volume sensor in fnOS."""
 
     entity_description: FnosSensorEntityDescription
@@ -394,12 +717,11 @@ class FnosVolumeSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
         volume
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
-        self.volume_name = volume.get("name")
-        volume_uuid = volume.get("uuid")
-        trim_version = self.coordinator.data["host_name"].get("trimVersion")
-        # hostName实际上“设置”页可修改的“设备名称”
-        host_name = self.coordinator.data.get("host_name").get("hostName")
+        super().__init__(coordinator, context=description.section)
+        self.volume_name = volume.name
+        self.volume_uuid = volume_uuid = volume.uuid
+        trim_version = coordinator.device.trim_version
+        host_name = coordinator.device.host_name
 
         self.entity_description = description
         self._attr_unique_id = (
@@ -416,23 +738,12 @@ class FnosVolumeSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
         )
 
     @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        data = {}
-        for item in self.coordinator.data.get("store").get("array"):
-            if item.get("name") == self.volume_name:
-                data = item
-                break
-
-        return self.entity_description.value_fn(data)
-
-    @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    def resource(self):
+        """Return the key of the volume."""
+        return self.volume_uuid
 
 
-class FnosDiskSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
+class FnosDiskSensorEntity(FnosCoordinatorSensorEntity):
     """Representation of a disk sensor in fnOS."""
 
     entity_description: FnosSensorEntityDescription
@@ -442,23 +753,24 @@ class FnosDiskSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
         self,
         coordinator: FnosCoordinator,
         description: FnosSensorEntityDescription,
-        disk
+        disk,
+        inventory: FnosCoordinator,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.section)
+        self.inventory = inventory
         _LOGGER.warning("[FnosDiskSensorEntity] disk: %s", disk)
         _LOGGER.warning(
-            "[FnosDiskSensorEntity] coordinator.data.get(disk): %s",
-            self.coordinator.data.get("disk")
+            "[FnosDiskSensorEntity] coordinator.data.get(%s): %s",
+            description.section, self.coordinator.data.get(description.section)
         )
 
-        self.disk_name = disk.get("name")
-        disk_sn = disk.get("serialNumber")
-        disk_model = disk.get("modelName")
-        disk_vendor = disk.get("vendor")
-        trim_version = self.coordinator.data["host_name"].get("trimVersion")
-        # hostName实际上“设置”页可修改的“设备名称”
-        host_name = self.coordinator.data.get("host_name").get("hostName")
+        self.disk_name = disk.name
+        self.disk_sn = disk_sn = disk.serial_number
+        disk_model = disk.model_name
+        disk_vendor = disk.vendor
+        trim_version = coordinator.device.trim_version
+        host_name = coordinator.device.host_name
 
         self.entity_description = description
         self._attr_unique_id = (
@@ -474,27 +786,31 @@ class FnosDiskSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
             via_device=(DOMAIN, coordinator.machine_id),
         )
 
-    @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        data = {}
-        for item in self.coordinator.data.get("disk"):
-            if item.get("name") == self.disk_name:
-                data = item
-                break
-
-        return self.entity_description.value_fn(data)
+    async def async_added_to_hass(self) -> None:
+        """Keep the disk list fetched while the sensor is around."""
+        await super().async_added_to_hass()
+        if self.inventory is not self.coordinator:
+            # Disk names are resolved through the disk list of the slow tier
+            self.async_on_remove(
+                self.inventory.async_add_listener(lambda: None, SECTION_DISK)
+            )
 
     @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    def resource(self):
+        """Return the key of the disk in the section of the sensor."""
+        if self.entity_description.section in (SECTION_DISK, SECTION_SMART):
+            return self.disk_sn
+
+        # Other sections know disks by name only, which changes when
+        # disks are swapped or re-enumerated
+        return self.coordinator.device.disk_names.get(self.disk_sn)
 
-class FnosNetworkIfsSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntity):
+class FnosNetworkIfsSensorEntity(FnosCoordinatorSensorEntity):
     """Representation of a network ifs sensor in fnOS."""
 
     entity_description: FnosSensorEntityDescription
     _attr_has_entity_name = True
+    _unrecorded_attributes = frozenset({ATTR_MIN, ATTR_MAX})
 
     def __init__(
         self,
@@ -503,17 +819,16 @@ class FnosNetworkIfsSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntit
         ifs
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.section)
         _LOGGER.info("[FnosNetworkIfsSensorEntity] ifs: %s", ifs)
         _LOGGER.info(
             "[FnosNetworkIfsSensorEntity] coordinator.data.get(ifs): %s",
-            self.coordinator.data.get("ifs")
+            self.coordinator.data.get(SECTION_NET)
         )
 
-        self.ifs_name = ifs.get("name")
-        trim_version = self.coordinator.data["host_name"].get("trimVersion")
-        # hostName实际上“设置”页可修改的“设备名称”
-        host_name = self.coordinator.data.get("host_name").get("hostName")
+        self.ifs_name = ifs.name
+        trim_version = coordinator.device.trim_version
+        host_name = coordinator.device.host_name
 
         self.entity_description = description
         self._attr_unique_id = (
@@ -530,17 +845,51 @@ class FnosNetworkIfsSensorEntity(CoordinatorEntity[FnosCoordinator], SensorEntit
         )
 
     @property
-    def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        data = {}
-        for item in self.coordinator.data.get("net").get("ifs"):
-            if item.get("name") == self.ifs_name:
-                data = item
-                break
+    def resource(self):
+        """Return the key of the interface."""
+        return self.ifs_name
+
+    @property
+    def extra_state_attributes(self):
+        """Return the range of the value when sampled."""
+        return _sample_attributes(
+            self.coordinator, self.entity_description, self.ifs_name
+        )
+
+
+class FnosStatsSensorEntity(SensorEntity):
+    """Representation of a statistic of the fnOS API calls."""
+
+    entity_description: FnosStatsSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        data: FnosData,
+        description: FnosStatsSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        coordinator = data.coordinators[TIER_SLOW]
+        self.stats = data.connection.stats
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{coordinator.machine_id}_{description.key}"
+        )
+        self._attr_device_info = coordinator.device_info
 
-        return self.entity_description.value_fn(data)
+    async def async_added_to_hass(self) -> None:
+        """Update whenever one of the tiers has refreshed."""
+        await super().async_added_to_hass()
+        if self.entity_description.measures_size:
+            self.async_on_remove(self.stats.request_sizes())
+        # Coordinators only notify when the data changed, the statistics
+        # change with every refresh
+        self.async_on_remove(
+            self.stats.add_refresh_listener(self.async_write_ha_state)
+        )
 
     @property
-    def available(self) -> bool:
-        """Return if entity is available."""
-        return self.coordinator.last_update_success
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self.stats)
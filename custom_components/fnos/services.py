@@ -0,0 +1,81 @@
+"""Actions of the fnOS integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    ATTR_SECTIONS,
+    DOMAIN,
+    REFRESH_SECTIONS,
+    SECTION_TIERS,
+    SERVICE_REFRESH,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_SECTIONS): vol.All(
+            cv.ensure_list, [vol.In(REFRESH_SECTIONS)]
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the actions of the integration."""
+
+    async def _async_refresh(call: ServiceCall) -> None:
+        """Fetch sections of an entry right away.
+
+        Calls overlapping each other or a scheduled refresh share its
+        fetch, so a chatty automation does not add load on the NAS.
+        """
+        entry_id = call.data[ATTR_CONFIG_ENTRY_ID]
+        entry = hass.config_entries.async_get_entry(entry_id)
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state is not ConfigEntryState.LOADED
+        ):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN,
+                translation_key="entry_not_loaded",
+                translation_placeholders={"entry_id": entry_id},
+            )
+
+        by_tier = {}
+        for name in call.data.get(ATTR_SECTIONS, REFRESH_SECTIONS):
+            for section in REFRESH_SECTIONS[name]:
+                by_tier.setdefault(SECTION_TIERS[section], []).append(section)
+
+        coordinators = entry.runtime_data.coordinators
+        try:
+            await asyncio.gather(
+                *(
+                    coordinators[tier].async_refresh_sections(sections)
+                    for tier, sections in by_tier.items()
+                )
+            )
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            raise HomeAssistantError(
+                translation_domain=DOMAIN,
+                translation_key="refresh_failed",
+                translation_placeholders={"error": str(err)},
+            ) from err
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, _async_refresh, schema=REFRESH_SCHEMA
+    )
@@ -0,0 +1,202 @@
+"""Persisted snapshot of the last fnOS data, for warm starts."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from functools import partial
+import logging
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    SECTION_CPU,
+    SECTION_DISK,
+    SECTION_DISK_RESMON,
+    SECTION_MEMORY,
+    SECTION_NET,
+    SECTION_SMART,
+    SECTION_STORE,
+    SECTION_UPTIME,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_VALUES_SAVE_DELAY,
+    TIER_SECTIONS,
+    TIER_SLOW,
+)
+from .models import (
+    CpuRecord,
+    DiskRecord,
+    DiskResmonRecord,
+    InterfaceRecord,
+    MemoryRecord,
+    SmartRecord,
+    VolumeRecord,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+# Record type of each section, and whether the section lists resources
+_SECTION_RECORDS = {
+    SECTION_CPU: (CpuRecord, False),
+    SECTION_MEMORY: (MemoryRecord, False),
+    SECTION_NET: (InterfaceRecord, True),
+    SECTION_STORE: (VolumeRecord, True),
+    SECTION_DISK_RESMON: (DiskResmonRecord, True),
+    SECTION_DISK: (DiskRecord, True),
+    SECTION_SMART: (SmartRecord, True),
+}
+
+
+def _dump_section(section, value):
+    """Return a section as JSON serializable data."""
+    if section == SECTION_UPTIME or value is None:
+        return value
+    if _SECTION_RECORDS[section][1]:
+        return [asdict(record) for record in value]
+    return asdict(value)
+
+
+def _load_section(section, value):
+    """Return a section from its serialized data."""
+    if section == SECTION_UPTIME or value is None:
+        return value
+    record, listed = _SECTION_RECORDS[section]
+    if listed:
+        return tuple(record(**item) for item in value)
+    return record(**value)
+
+
+def _inventory(device, coordinators):
+    """Return the device identity and the resources of each section."""
+    resources = {}
+    for coordinator in coordinators.values():
+        for section in TIER_SECTIONS[coordinator.tier]:
+            if section in _SECTION_RECORDS and _SECTION_RECORDS[section][1]:
+                keys = coordinator.get_resources(section)
+                resources[section] = None if keys is None else set(keys)
+    return (
+        device.machine_id,
+        device.model,
+        device.host_name,
+        device.trim_version,
+        device.disk_names,
+        resources,
+    )
+
+
+class FnosSnapshotStore:
+    """The last device identity and data of a config entry, in HA storage."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        # Delay of the pending save, None when none is pending
+        self._save_delay = None
+        # Device identity and resources of each section as last saved
+        self._saved_inventory = None
+
+    async def async_restore(self, device, coordinators) -> bool:
+        """Restore the device and coordinators, return False without a snapshot.
+
+        Restored coordinators are stale: their entities are unavailable
+        until the first live refresh lands.
+        """
+        stored = await self._store.async_load()
+        if not stored:
+            return False
+
+        try:
+            sections = {
+                section: _load_section(section, value)
+                for section, value in stored["sections"].items()
+                # Sections an older version polled are left out
+                if section in _SECTION_RECORDS or section == SECTION_UPTIME
+            }
+            identity = stored["device"]
+            smart_cache = {
+                serial: (fetched, passed)
+                for serial, (fetched, passed) in stored["smart_cache"].items()
+            }
+        except (KeyError, TypeError, ValueError) as err:
+            # Written by another version of the integration
+            _LOGGER.warning("Ignoring the stored fnOS snapshot: %s", err)
+            return False
+
+        device.host_name = identity["host_name"]
+        device.trim_version = identity["trim_version"]
+        device.disk_names = identity["disk_names"]
+        device.set_identity(identity["machine_id"], identity["model"])
+
+        for tier, coordinator in coordinators.items():
+            coordinator.async_restore(
+                {
+                    section: sections[section]
+                    for section in TIER_SECTIONS[tier] if section in sections
+                },
+                smart_cache if tier == TIER_SLOW else {},
+            )
+        return True
+
+    @callback
+    def async_track(self, device, coordinators) -> CALLBACK_TYPE:
+        """Save a snapshot as coordinator data changes until cancelled.
+
+        A new device identity or resources appearing or leaving are saved
+        after SNAPSHOT_SAVE_DELAY. New values alone only keep a save
+        pending, so that they are written when Home Assistant stops,
+        without rewriting the storage file every refresh.
+        """
+        schedule_save = partial(self._async_schedule_save, device, coordinators)
+        removes = [
+            coordinator.async_add_passive_listener(schedule_save)
+            for coordinator in coordinators.values()
+        ]
+        # Data of the first refreshes came before the listeners
+        schedule_save()
+
+        @callback
+        def _remove() -> None:
+            for remove in removes:
+                remove()
+
+        return _remove
+
+    @callback
+    def _async_schedule_save(self, device, coordinators) -> None:
+        """Save a snapshot after a delay, unless one comes sooner."""
+        delay = SNAPSHOT_VALUES_SAVE_DELAY
+        if _inventory(device, coordinators) != self._saved_inventory:
+            delay = SNAPSHOT_SAVE_DELAY
+        # A new delayed save would postpone the pending one
+        if self._save_delay is not None and self._save_delay <= delay:
+            return
+        self._save_delay = delay
+        self._store.async_delay_save(
+            partial(self._snapshot, device, coordinators), delay
+        )
+
+    def _snapshot(self, device, coordinators) -> dict:
+        """Return the snapshot to save."""
+        self._save_delay = None
+        self._saved_inventory = _inventory(device, coordinators)
+        sections = {}
+        for coordinator in coordinators.values():
+            for section, value in (coordinator.data or {}).items():
+                sections[section] = _dump_section(section, value)
+        return {
+            "device": {
+                "machine_id": device.machine_id,
+                "model": device.model,
+                "host_name": device.host_name,
+                "trim_version": device.trim_version,
+                "disk_names": device.disk_names,
+            },
+            "sections": sections,
+            "smart_cache": coordinators[TIER_SLOW].export_smart_cache(),
+        }
+
+    async def async_remove(self) -> None:
+        """Remove the snapshot."""
+        await self._store.async_remove()
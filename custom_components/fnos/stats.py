@@ -0,0 +1,226 @@
+"""Latency and payload size statistics of the fnOS API calls."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import json
+import time
+
+from fnos import ResourceMonitor, Store, SystemInfo
+
+from .const import (
+    DIAGNOSTICS_CYCLES,
+    DIAGNOSTICS_RECONNECTS,
+    ENDPOINT_RESMON,
+    ENDPOINT_SMART,
+    ENDPOINT_STORE,
+    ENDPOINT_SYSINFO,
+    STATS_WINDOW,
+)
+
+_ENDPOINT_GROUPS = {
+    ResourceMonitor: ENDPOINT_RESMON,
+    Store: ENDPOINT_STORE,
+    SystemInfo: ENDPOINT_SYSINFO,
+}
+
+# Refresh cycle the calls of the running task belong to
+_current_cycle: ContextVar[RefreshCycle | None] = ContextVar(
+    "fnos_refresh_cycle", default=None
+)
+
+
+def endpoint_group(method) -> str:
+    """Return the endpoint group an API method is accounted to."""
+    # SMART is queried per disk and far slower than the rest of stor.*
+    if method.__name__ == "get_disk_smart":
+        return ENDPOINT_SMART
+    owner = getattr(method, "__self__", None)
+    return _ENDPOINT_GROUPS.get(type(owner), method.__name__)
+
+
+def endpoint_name(method) -> str:
+    """Return the name of an API method, as in Store.general."""
+    owner = getattr(method, "__self__", None)
+    if owner is None:
+        return method.__name__
+    return f"{type(owner).__name__}.{method.__name__}"
+
+
+def payload_size(resp) -> int:
+    """Return the size in bytes of a response as it went over the websocket."""
+    return len(
+        json.dumps(resp, ensure_ascii=False, separators=(",", ":")).encode()
+    )
+
+
+@dataclass(slots=True)
+class CallRecord:
+    """One API call of a refresh cycle."""
+
+    endpoint: str
+    start: float
+    end: float
+    size: int | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class RefreshCycle:
+    """The API calls made by one refresh of a tier."""
+
+    tier: str
+    start: float
+    end: float | None = None
+    error: str | None = None
+    calls: list[CallRecord] = field(default_factory=list)
+
+
+class EndpointStats:
+    """Statistics of the calls of one endpoint group."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        # Latencies of the last calls in milliseconds
+        self.latencies: deque[float] = deque(maxlen=STATS_WINDOW)
+        self.last_size: int | None = None
+        self.calls = 0
+        self.failures = 0
+
+    @property
+    def last(self) -> float | None:
+        """Return the latency of the last call."""
+        return self.latencies[-1] if self.latencies else None
+
+    @property
+    def avg(self) -> float | None:
+        """Return the average latency over the window."""
+        if not self.latencies:
+            return None
+        return sum(self.latencies) / len(self.latencies)
+
+    @property
+    def p95(self) -> float | None:
+        """Return the 95th percentile latency over the window."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+class FnosStats:
+    """Statistics of the connection to fnOS and the refreshes using it."""
+
+    def __init__(self) -> None:
+        """Initialize the statistics."""
+        self.endpoints: dict[str, EndpointStats] = {}
+        # tier -> duration of the last refresh in milliseconds
+        self.refresh_durations: dict[str, float] = {}
+        self.reconnects = 0
+        self.failed_calls = 0
+        # Number of sensors and downloads wanting the payload sizes
+        self._size_requests = 0
+        # Kept for the diagnostics download
+        self.cycles: deque[RefreshCycle] = deque(maxlen=DIAGNOSTICS_CYCLES)
+        self.reconnect_events: deque[dict] = deque(
+            maxlen=DIAGNOSTICS_RECONNECTS
+        )
+        # endpoint name -> last response, one per name so it stays bounded
+        self.samples: dict[str, dict] = {}
+        # Called at the end of every refresh, such as by the sensors
+        self._refresh_listeners: list[Callable[[], None]] = []
+
+    def endpoint(self, group: str) -> EndpointStats:
+        """Return the statistics of an endpoint group."""
+        if (stats := self.endpoints.get(group)) is None:
+            stats = self.endpoints[group] = EndpointStats()
+        return stats
+
+    def request_sizes(self) -> Callable[[], None]:
+        """Measure the payload sizes until the returned callable is called.
+
+        The fnos client does not tell how long the frames it decoded
+        were, and encoding every response again on the event loop costs
+        about as much as decoding it did. Only the payload size sensors
+        need them, diagnostics measure the samples when downloaded.
+        """
+        self._size_requests += 1
+
+        def _release() -> None:
+            self._size_requests -= 1
+
+        return _release
+
+    def add_refresh_listener(
+        self, update_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """Call update_callback after each refresh until removed.
+
+        Refreshes that fail or leave the data as it was count too.
+        """
+        self._refresh_listeners.append(update_callback)
+
+        def _remove() -> None:
+            self._refresh_listeners.remove(update_callback)
+
+        return _remove
+
+    def record_call(self, method, start: float, duration: float, resp) -> None:
+        """Record a successful call, start in epoch and duration in seconds."""
+        size = payload_size(resp) if self._size_requests else None
+        stats = self.endpoint(endpoint_group(method))
+        stats.latencies.append(duration * 1000)
+        if size is not None:
+            stats.last_size = size
+        stats.calls += 1
+
+        name = endpoint_name(method)
+        self.samples[name] = resp
+        if (cycle := _current_cycle.get()) is not None:
+            cycle.calls.append(CallRecord(name, start, start + duration, size))
+
+    def record_failure(
+        self, method, start: float, duration: float, err
+    ) -> None:
+        """Record a call that raised."""
+        self.endpoint(endpoint_group(method)).failures += 1
+        self.failed_calls += 1
+
+        if (cycle := _current_cycle.get()) is not None:
+            cycle.calls.append(
+                CallRecord(
+                    endpoint_name(method),
+                    start,
+                    start + duration,
+                    error=repr(err),
+                )
+            )
+
+    def record_reconnect(self, error=None) -> None:
+        """Record a reconnect attempt, with its error if it failed."""
+        self.reconnects += 1
+        self.reconnect_events.append(
+            {
+                "time": time.time(),
+                "error": None if error is None else repr(error),
+            }
+        )
+
+    def start_refresh(self, tier: str) -> RefreshCycle:
+        """Start recording the calls of a refresh of a tier."""
+        cycle = RefreshCycle(tier, time.time())
+        self.cycles.append(cycle)
+        _current_cycle.set(cycle)
+        return cycle
+
+    def end_refresh(self, cycle: RefreshCycle, error=None) -> None:
+        """Finish recording a refresh, with its error if it failed."""
+        cycle.end = time.time()
+        if error is not None:
+            cycle.error = repr(error)
+        _current_cycle.set(None)
+        self.refresh_durations[cycle.tier] = (cycle.end - cycle.start) * 1000
+        for update_callback in list(self._refresh_listeners):
+            update_callback()
@@ -0,0 +1 @@
+"""Offline benchmark and soak test of the fnOS integration."""
@@ -0,0 +1,215 @@
+"""Offline benchmark of the fnOS coordinators and sensors.
+
+Drives FnosCoordinator and the sensor entities against a FakeFnosClient
+serving the recorded responses, scaled up to several disk counts, and
+reports refresh wall time, native_value cost and allocations.
+
+Run from the repository root, with Home Assistant installed:
+
+    python -m custom_components.fnos.tests.benchmark --disks 4 24 96
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+import inspect
+import statistics
+import tempfile
+import time
+import tracemalloc
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .. import FnosData
+from .. import sensor
+from ..connection import FnosConnection
+from ..const import (
+    CONF_SMART_TTL,
+    DOMAIN,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SECTIONS,
+    TIER_SLOW,
+)
+from ..coordinator import FnosCoordinator, FnosDevice
+from .fake_nas import FakeFnosClient, FakeNas
+
+
+def make_config_entry(options: dict, host: str = "fake:5666") -> ConfigEntry:
+    """Create a config entry, whatever the Home Assistant version wants."""
+    kwargs = {
+        "version": 1,
+        "minor_version": 1,
+        "domain": DOMAIN,
+        "title": "benchmark",
+        "data": {CONF_HOST: host, CONF_USERNAME: "u", CONF_PASSWORD: "p"},
+        "source": "user",
+        "options": options,
+        "unique_id": None,
+    }
+    parameters = inspect.signature(ConfigEntry).parameters
+    if "discovery_keys" in parameters:
+        kwargs["discovery_keys"] = MappingProxyType({})
+    if "subentries_data" in parameters:
+        kwargs["subentries_data"] = ()
+    return ConfigEntry(**kwargs)
+
+
+async def async_first_refresh(coordinators: dict) -> None:
+    """Load the device identity and refresh the tiers, failing loudly.
+
+    async_config_entry_first_refresh only works while Home Assistant sets
+    up a config entry, with its frame helper in place, so the identity
+    setup it would run is called here directly.
+    """
+    for coordinator in coordinators.values():
+        await coordinator._async_setup()  # pylint: disable=protected-access
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise coordinator.last_exception
+
+
+def _summary(samples: list[float]) -> str:
+    """Return median, p95 and max of durations in seconds, as milliseconds."""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"median {statistics.median(ordered) * 1000:8.2f} ms"
+        f"  p95 {p95 * 1000:8.2f} ms  max {ordered[-1] * 1000:8.2f} ms"
+    )
+
+
+async def _async_benchmark(args, disks: int) -> None:
+    """Benchmark one disk count."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = make_config_entry({CONF_SMART_TTL: args.smart_ttl})
+        client = FakeFnosClient(
+            FakeNas(
+                disks=disks, volumes=args.volumes, interfaces=args.interfaces
+            ),
+            latency=args.latency,
+        )
+        connection = FnosConnection(client, "fake:5666", "u", "p")
+        await connection.async_connect()
+
+        device = FnosDevice()
+        coordinators = {
+            tier: FnosCoordinator(hass, entry, connection, tier, device)
+            for tier in (TIER_SLOW, TIER_MEDIUM, TIER_FAST)
+        }
+        start = time.perf_counter()
+        await async_first_refresh(coordinators)
+        setup = time.perf_counter() - start
+        start = time.perf_counter()
+        for coordinator in coordinators.values():
+            if coordinator.needs_warm_up:
+                await coordinator.async_refresh()
+        warm_up = time.perf_counter() - start
+
+        entry.runtime_data = FnosData(
+            api=client,
+            connection=connection,
+            coordinators=coordinators,
+            options=dict(entry.options),
+        )
+        entities = []
+        await sensor.async_setup_entry(hass, entry, entities.extend)
+
+        # Listen to every section, as if all entities were enabled
+        unsubscribes = [
+            coordinator.async_add_listener(lambda: None, section)
+            for tier, coordinator in coordinators.items()
+            for section in TIER_SECTIONS[tier]
+        ]
+
+        print(
+            f"\n{disks} disks, {args.volumes} volumes,"
+            f" {args.interfaces} interfaces:"
+            f" {len(entities)} entities, first refresh {setup * 1000:.1f} ms,"
+            f" warm-up {warm_up * 1000:.1f} ms"
+        )
+
+        for tier, coordinator in coordinators.items():
+            durations = []
+            requests = client.requests
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                await coordinator.async_refresh()
+                durations.append(time.perf_counter() - start)
+            requests = (client.requests - requests) / args.rounds
+
+            tracemalloc.start()
+            await coordinator.async_refresh()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"  refresh {tier:6} {_summary(durations)}"
+                f"  {requests:5.1f} requests  peak alloc {peak / 1024:8.1f} KiB"
+            )
+
+        costs = defaultdict(list)
+        for entity in entities:
+            start = time.perf_counter_ns()
+            for _ in range(args.value_calls):
+                entity.native_value  # pylint: disable=pointless-statement
+            costs[type(entity).__name__].append(
+                (time.perf_counter_ns() - start) / args.value_calls
+            )
+
+        tracemalloc.start()
+        for entity in entities:
+            entity.native_value  # pylint: disable=pointless-statement
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        for name, samples in sorted(costs.items()):
+            print(
+                f"  native_value {name:28} {len(samples):4} entities"
+                f"  mean {statistics.mean(samples):8.0f} ns"
+                f"  max {max(samples):8.0f} ns"
+            )
+        print(
+            f"  native_value of all entities: peak alloc {peak / 1024:.1f} KiB"
+        )
+
+        for unsubscribe in unsubscribes:
+            unsubscribe()
+        for coordinator in coordinators.values():
+            await coordinator.async_shutdown()
+        await connection.async_close()
+        await hass.async_stop(force=True)
+
+
+async def _async_main(args) -> None:
+    """Benchmark every disk count."""
+    for disks in args.disks:
+        await _async_benchmark(args, disks)
+
+
+def main() -> None:
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--disks", type=int, nargs="+", default=[4, 24, 96])
+    parser.add_argument("--volumes", type=int, default=4)
+    parser.add_argument("--interfaces", type=int, default=2)
+    parser.add_argument(
+        "--latency", type=float, default=0.005,
+        help="latency of every request in seconds",
+    )
+    parser.add_argument(
+        "--smart-ttl", type=int, default=0,
+        help="S.M.A.R.T cache lifetime, 0 queries every disk on every refresh",
+    )
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--value-calls", type=int, default=1000)
+    asyncio.run(_async_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
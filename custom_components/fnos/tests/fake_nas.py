@@ -0,0 +1,191 @@
+"""A fake fnOS NAS serving the recorded responses, for offline benchmarks.
+
+The responses in tests/responses are scaled up to the requested number
+of disks, volumes and network interfaces. Requests that have no recorded
+response (CPU, memory, network, system info) get a minimal synthetic one.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+from pathlib import Path
+import random
+import string
+
+from fnos import NotConnectedError
+
+RESPONSES = Path(__file__).parent / "responses"
+
+
+def _load(name: str) -> dict:
+    """Return a recorded response."""
+    with open(RESPONSES / f"{name}.json", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _disk_name(index: int) -> str:
+    """Return the Linux name of the n-th disk: sda .. sdz, sdaa .."""
+    letters = string.ascii_lowercase
+    name = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        name = letters[rest] + name
+    return f"sd{name}"
+
+
+def _scaled(items: list, count: int, rename) -> list:
+    """Repeat recorded items up to count, renaming the copies."""
+    scaled = []
+    for index in range(count):
+        item = copy.deepcopy(items[index % len(items)])
+        rename(item, index)
+        scaled.append(item)
+    return scaled
+
+
+class FakeNas:
+    """Responses of a fake NAS with a configurable number of resources."""
+
+    def __init__(
+        self, disks: int = 5, volumes: int = 2, interfaces: int = 1
+    ) -> None:
+        """Build the responses."""
+        self.disks = disks
+        self.volumes = volumes
+        self.interfaces = interfaces
+        self.uptime = 1234
+
+        list_disk = _load("stor.listDisk")
+        list_disk["disk"] = _scaled(list_disk["disk"], disks, self._rename_disk)
+
+        resmon_disk = _load("resmon.disk")
+        resmon_disk["data"]["disk"] = _scaled(
+            resmon_disk["data"]["disk"], disks,
+            lambda item, index: item.update(name=_disk_name(index)),
+        )
+        resmon_disk["data"]["num"] = disks
+
+        general = _load("stor.general")
+        general["array"] = _scaled(
+            general["array"], volumes,
+            lambda item, index: item.update(
+                name=f"dm-{index}", uuid=f"trim_{index:08x}-0",
+                mountpoint=f"/vol{index + 1}",
+            ),
+        )
+
+        # Responses are kept serialized, decoding them on every request
+        # costs what decoding a websocket message costs the real client
+        self._responses = {
+            "stor.listDisk": json.dumps(list_disk),
+            "appcgi.resmon.disk": json.dumps(resmon_disk),
+            "stor.general": json.dumps(general),
+            "stor.diskSmart": json.dumps(_load("stor.diskSmart")),
+            "appcgi.sysinfo.getHostName": json.dumps(
+                {"data": {"hostName": "fake-nas", "trimVersion": "0.9.0"},
+                 "result": "succ"}
+            ),
+            "appcgi.sysinfo.getMachineId": json.dumps(
+                {"data": {"machineId": "fake-machine"}, "result": "succ"}
+            ),
+            "appcgi.sysinfo.getHardwareInfo": json.dumps(
+                {"data": {"cpu": {"name": "Fake CPU"}}, "result": "succ"}
+            ),
+        }
+
+    @staticmethod
+    def _rename_disk(item: dict, index: int) -> None:
+        """Give a copied disk its own name and serial number."""
+        item["name"] = _disk_name(index)
+        item["serialNumber"] = f"FAKE{index:08d}"
+
+    def respond(self, req: str) -> dict:
+        """Return the response to a request, whatever its payload."""
+        if req == "appcgi.resmon.cpu":
+            return {"data": {"cpu": {
+                "busy": {"all": random.randint(0, 100), "user": 5,
+                         "system": 3, "other": 2},
+                "loadavg": {"avg1min": 0.1, "avg5min": 0.2, "avg15min": 0.3},
+                "temp": [random.randint(40, 60)],
+            }}, "result": "succ"}
+        if req == "appcgi.resmon.mem":
+            return {"data": {
+                "mem": {"total": 16 << 30, "used": random.randint(1, 16) << 30,
+                        "free": 1 << 30, "cached": 2 << 30},
+                "swap": {"total": 4 << 30, "free": 4 << 30},
+            }, "result": "succ"}
+        if req == "appcgi.resmon.net":
+            return {"data": {"ifs": [
+                {"name": f"eth{index}", "transmit": random.randint(0, 1 << 20),
+                 "receive": random.randint(0, 1 << 20)}
+                for index in range(self.interfaces)
+            ]}, "result": "succ"}
+        if req == "appcgi.sysinfo.getUptime":
+            return {"data": {"uptime": self.uptime}, "result": "succ"}
+
+        response = self._responses.get(req)
+        if response is None:
+            raise KeyError(f"No fake response for {req}")
+        return json.loads(response)
+
+
+class FakeFnosClient:
+    """Stand-in for fnos.FnosClient, answering from a FakeNas."""
+
+    # pylint: disable=unused-argument
+    # The methods take the arguments of fnos.FnosClient they stand in for
+
+    def __init__(self, nas: FakeNas, latency: float = 0.0) -> None:
+        """Initialize the client."""
+        self.nas = nas
+        self.latency = latency
+        self.connected = False
+        self.endpoint = None
+        self.token = self.long_token = self.decrypted_secret = None
+        self.host_name = self.trim_version = None
+        self.pending_requests = {}
+        self.on_message_callback = None
+        self.requests = 0
+
+    def on_message(self, callback) -> None:
+        """Register the message callback."""
+        self.on_message_callback = callback
+
+    async def connect(self, endpoint, *args, **kwargs) -> None:
+        """Pretend to connect, learning the host name as FnosClient does."""
+        self.endpoint = endpoint
+        self.connected = True
+        host = self.nas.respond("appcgi.sysinfo.getHostName")["data"]
+        self.host_name = host["hostName"]
+        self.trim_version = host["trimVersion"]
+
+    async def login(self, username, password, *args, **kwargs) -> dict:
+        """Pretend to log in with a password."""
+        self.token, self.long_token, self.decrypted_secret = "t", "lt", "s"
+        return {"result": "succ", "token": self.token}
+
+    async def login_via_token(
+        self, token, long_token, secret, *args, **kwargs
+    ) -> dict:
+        """Pretend to resume a session."""
+        self.token = token
+        self.long_token = long_token
+        self.decrypted_secret = secret
+        return {"result": "succ"}
+
+    async def close(self) -> None:
+        """Pretend to close the connection."""
+        self.connected = False
+
+    async def request_payload_with_response(
+        self, req: str, payload: dict, timeout: float = 10.0
+    ) -> dict:
+        """Answer a request after the configured latency."""
+        if not self.connected:
+            raise NotConnectedError("Not connected")
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.nas.respond(req)
@@ -0,0 +1,391 @@
+"""A local stand-in for the fnOS websocket server, for load and soak tests.
+
+Speaks the part of the fnOS protocol used by the fnos client: the RSA
+public key handshake, encrypted password login, token login, signed
+requests, heartbeats and pushed messages. Answers come from FakeNas.
+
+Start it from the repository root:
+
+    python -m custom_components.fnos.tests.fake_server --port 5666 --disks 24
+
+then log in to 127.0.0.1:5666 with any user name and password (or the
+ones given with --username and --password).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import random
+import secrets
+import time
+
+from Crypto.Cipher import AES, PKCS1_v1_5
+from Crypto.PublicKey import RSA
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import pad, unpad
+import websockets
+
+from .fake_nas import FakeNas
+
+_LOGGER = logging.getLogger(__name__)
+
+# Length of the base64 HMAC-SHA256 signature prefixed to signed requests
+_SIGNATURE_LENGTH = 44
+# errno of user.authToken when the token has expired
+_ERRNO_TOKEN_EXPIRED = 135168
+
+# Requests pushed to the clients, as fnOS does while its pages are open
+_PUSHED = (
+    "appcgi.resmon.cpu",
+    "appcgi.resmon.mem",
+    "appcgi.resmon.net",
+    "appcgi.resmon.disk",
+)
+
+
+class FakeFnosServer:
+    """A fake fnOS websocket server with failure and latency knobs."""
+
+    def __init__(
+        self,
+        nas: FakeNas,
+        *,
+        username: str | None = None,
+        password: str | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        drop_rate: float = 0.0,
+        outage_every: float = 0.0,
+        outage_for: float = 0.0,
+        push_interval: float = 0.0,
+        token_ttl: float = 0.0,
+    ) -> None:
+        """Initialize the server.
+
+        latency and jitter delay every answer, drop_rate is the chance a
+        request drops the connection instead, outage_every / outage_for
+        periodically drop every connection and refuse new ones for a
+        while, push_interval pushes resmon data to logged in clients and
+        token_ttl expires short lived tokens, all in seconds.
+        """
+        self.nas = nas
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.jitter = jitter
+        self.drop_rate = drop_rate
+        self.outage_every = outage_every
+        self.outage_for = outage_for
+        self.push_interval = push_interval
+        self.token_ttl = token_ttl
+
+        self._rsa = RSA.generate(2048)
+        self._public_key = self._rsa.publickey().export_key().decode()
+        # token -> (secret, time issued), long token -> secret
+        self._tokens: dict[str, tuple[bytes, float]] = {}
+        self._long_tokens: dict[str, bytes] = {}
+        self._connections: set = set()
+        self._outage_until = 0.0
+        self._outages: asyncio.Task | None = None
+
+        self.stats = {
+            "connections": 0,
+            "refused": 0,
+            "dropped": 0,
+            "logins": 0,
+            "token_logins": 0,
+            "requests": 0,
+            "pushed": 0,
+        }
+
+    @property
+    def in_outage(self) -> bool:
+        """Return True while new connections are refused."""
+        return time.monotonic() < self._outage_until
+
+    def set_faults(
+        self,
+        drop_rate: float = 0.0,
+        outage_every: float = 0.0,
+        outage_for: float = 0.0,
+    ) -> None:
+        """Change the drop and outage knobs of a running server."""
+        self.drop_rate = drop_rate
+        self.outage_every = outage_every
+        self.outage_for = outage_for
+        if self._outages is not None:
+            self._outages.cancel()
+            self._outages = None
+        if outage_every:
+            self._outages = asyncio.create_task(self._async_outages())
+
+    async def async_serve(self, host: str = "127.0.0.1", port: int = 5666):
+        """Serve until cancelled."""
+        self.set_faults(self.drop_rate, self.outage_every, self.outage_for)
+        try:
+            async with websockets.serve(self._async_handle, host, port):
+                _LOGGER.info("Fake fnOS listening on %s:%s", host, port)
+                await asyncio.Future()
+        finally:
+            if self._outages is not None:
+                self._outages.cancel()
+
+    async def _async_outages(self) -> None:
+        """Periodically drop every connection and refuse new ones."""
+        while True:
+            await asyncio.sleep(self.outage_every)
+            _LOGGER.info("Outage for %ss", self.outage_for)
+            self._outage_until = time.monotonic() + self.outage_for
+            for connection in list(self._connections):
+                await connection.close()
+
+    async def _async_handle(self, connection) -> None:
+        """Serve one websocket connection."""
+        if self.in_outage:
+            self.stats["refused"] += 1
+            await connection.close(1013, "Try again later")
+            return
+
+        self.stats["connections"] += 1
+        self._connections.add(connection)
+        session = _Session(secrets.token_hex(8))
+        # Answered concurrently, as fnOS does: a slow request does not
+        # hold back the ones sent after it
+        replies = set()
+        try:
+            async for message in connection:
+                reply = asyncio.create_task(
+                    self._async_reply(connection, session, message)
+                )
+                replies.add(reply)
+                reply.add_done_callback(replies.discard)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._connections.discard(connection)
+            for reply in replies:
+                reply.cancel()
+            if session.pusher is not None:
+                session.pusher.cancel()
+
+    async def _async_reply(self, connection, session, message) -> None:
+        """Answer one message of a connection."""
+        try:
+            answer = await self._async_answer(session, message)
+            if answer is _DROP:
+                self.stats["dropped"] += 1
+                await connection.close()
+                return
+            if answer is not None:
+                await connection.send(json.dumps(answer, ensure_ascii=False))
+        except websockets.ConnectionClosed:
+            return
+        if session.secret and session.pusher is None and self.push_interval:
+            session.pusher = asyncio.create_task(self._async_push(connection))
+
+    async def _async_push(self, connection) -> None:
+        """Push resmon data, as fnOS does to its web pages."""
+        while True:
+            await asyncio.sleep(self.push_interval)
+            for req in _PUSHED:
+                message = self.nas.respond(req)
+                message.update(
+                    req=req, reqid=secrets.token_hex(12), result="succ"
+                )
+                await connection.send(json.dumps(message))
+                self.stats["pushed"] += 1
+
+    async def _async_answer(self, session: _Session, message: str):
+        """Return the answer to a message, None for none, _DROP to drop."""
+        if message.startswith("{"):
+            data = json.loads(message)
+        else:
+            # Signed request: HMAC of the JSON, then the JSON
+            signature = message[:_SIGNATURE_LENGTH]
+            message = message[_SIGNATURE_LENGTH:]
+            data = json.loads(message)
+            if not _verify(self._secret_of(session, data), signature, message):
+                return _fail(data, errno=1, msg="Bad signature")
+
+        req = data.get("req")
+        if req == "ping":
+            return {"res": "pong"}
+        if req == "util.crypto.getRSAPub":
+            return {
+                "pub": self._public_key, "si": session.session_id,
+                "reqid": data.get("reqid"), "result": "succ",
+            }
+        if req == "encrypted":
+            return self._login(session, data)
+
+        self.stats["requests"] += 1
+        if self.drop_rate and random.random() < self.drop_rate:
+            return _DROP
+        await self._async_delay()
+
+        if req == "user.authToken":
+            return self._auth_token(session, data)
+        if req == "user.tokenLogin":
+            return self._token_login(session, data)
+        if req != "appcgi.sysinfo.getHostName" and session.secret is None:
+            return _fail(data, errno=2, msg="Not logged in")
+
+        try:
+            answer = self.nas.respond(req)
+        except KeyError:
+            return _fail(data, errno=3, msg=f"Unknown request {req}")
+        answer.update(req=req, reqid=data.get("reqid"))
+        answer.setdefault("result", "succ")
+        return answer
+
+    def _secret_of(self, session: _Session, data: dict) -> bytes | None:
+        """Return the secret a request must be signed with."""
+        # Token logins are signed with the secret of the resumed session
+        if data.get("req") == "user.authToken":
+            return self._tokens.get(data.get("token"), (None, 0.0))[0]
+        if data.get("req") == "user.tokenLogin":
+            return self._long_tokens.get(data.get("token"))
+        return session.secret
+
+    async def _async_delay(self) -> None:
+        """Wait for the configured latency and jitter."""
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _login(self, session: _Session, data: dict) -> dict:
+        """Answer an encrypted user.login."""
+        aes_key = PKCS1_v1_5.new(self._rsa).decrypt(
+            base64.b64decode(data["rsa"]), None
+        )
+        iv = base64.b64decode(data["iv"])
+        cipher = AES.new(aes_key, AES.MODE_CBC, iv)
+        login = json.loads(
+            unpad(cipher.decrypt(base64.b64decode(data["aes"])), AES.block_size)
+        )
+        if (
+            self.username is not None and login.get("user") != self.username
+        ) or (
+            self.password is not None and login.get("password") != self.password
+        ):
+            return _fail(login, errno=4, msg="Invalid user name or password")
+
+        self.stats["logins"] += 1
+        secret = get_random_bytes(32)
+        session.secret = secret
+        token, long_token = secrets.token_hex(16), secrets.token_hex(16)
+        self._tokens[token] = (secret, time.monotonic())
+        self._long_tokens[long_token] = secret
+
+        # The secret is sent encrypted with the key the client chose
+        cipher = AES.new(aes_key, AES.MODE_CBC, iv)
+        encrypted = cipher.encrypt(pad(secret, AES.block_size))
+        return {
+            "result": "succ", "reqid": login.get("reqid"),
+            "token": token, "longToken": long_token,
+            "secret": base64.b64encode(encrypted).decode(),
+        }
+
+    def _auth_token(self, session: _Session, data: dict) -> dict:
+        """Answer user.authToken, resuming a session by its token."""
+        secret, issued = self._tokens.get(data.get("token"), (None, 0.0))
+        if secret is None or (
+            self.token_ttl and time.monotonic() - issued > self.token_ttl
+        ):
+            return _fail(data, errno=_ERRNO_TOKEN_EXPIRED, msg="Token expired")
+
+        self.stats["token_logins"] += 1
+        session.secret = secret
+        return {"result": "succ", "reqid": data.get("reqid")}
+
+    def _token_login(self, session: _Session, data: dict) -> dict:
+        """Answer user.tokenLogin, renewing the token from the long one."""
+        secret = self._long_tokens.get(data.get("token"))
+        if secret is None:
+            return _fail(data, errno=_ERRNO_TOKEN_EXPIRED, msg="Token expired")
+
+        self.stats["token_logins"] += 1
+        session.secret = secret
+        token = secrets.token_hex(16)
+        self._tokens[token] = (secret, time.monotonic())
+        return {"result": "succ", "reqid": data.get("reqid"), "token": token}
+
+
+class _Session:
+    """State of one websocket connection."""
+
+    def __init__(self, session_id: str) -> None:
+        """Initialize the session."""
+        self.session_id = session_id
+        self.secret: bytes | None = None
+        self.pusher: asyncio.Task | None = None
+
+
+def _verify(secret: bytes | None, signature: str, message: str) -> bool:
+    """Return True if a request was signed with the secret."""
+    if secret is None:
+        return False
+    expected = base64.b64encode(
+        hmac.new(secret, message.encode(), hashlib.sha256).digest()
+    ).decode()
+    return hmac.compare_digest(expected, signature)
+
+
+# Marker answer: drop the connection instead of answering
+_DROP = object()
+
+
+def _fail(data: dict, errno: int, msg: str) -> dict:
+    """Return a failed answer to a request."""
+    return {
+        "result": "fail", "reqid": data.get("reqid"), "errno": errno, "msg": msg
+    }
+
+
+def main() -> None:
+    """Parse the arguments and serve."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5666)
+    parser.add_argument("--username")
+    parser.add_argument("--password")
+    parser.add_argument("--disks", type=int, default=5)
+    parser.add_argument("--volumes", type=int, default=2)
+    parser.add_argument("--interfaces", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--outage-every", type=float, default=0.0)
+    parser.add_argument("--outage-for", type=float, default=0.0)
+    parser.add_argument("--push-interval", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FakeFnosServer(
+        FakeNas(
+            disks=args.disks, volumes=args.volumes, interfaces=args.interfaces
+        ),
+        username=args.username,
+        password=args.password,
+        latency=args.latency,
+        jitter=args.jitter,
+        drop_rate=args.drop_rate,
+        outage_every=args.outage_every,
+        outage_for=args.outage_for,
+        push_interval=args.push_interval,
+        token_ttl=args.token_ttl,
+    )
+    try:
+        asyncio.run(server.async_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print(json.dumps(server.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Check the setup of the fnOS coordinators against a fnOS websocket server.
+
+Connects with the real fnos client, loads the device identity, runs the
+first refresh and the warm-up of every tier and builds the sensors, each
+step with a timeout, then exits non-zero if anything is missing. Without
+--endpoint a FakeFnosServer is started in-process.
+
+    python -m custom_components.fnos.tests.setup_check
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from fnos import FnosClient
+
+from .. import FnosData
+from .. import sensor
+from ..connection import FnosConnection
+from ..const import TIER_FAST, TIER_MEDIUM, TIER_SLOW
+from ..coordinator import FnosCoordinator, FnosDevice
+from .benchmark import async_first_refresh, make_config_entry
+from .fake_nas import FakeNas
+from .fake_server import FakeFnosServer
+
+
+async def _async_check(args) -> list[str]:
+    """Set up against the server, return the problems found."""
+    server_task = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        server = FakeFnosServer(FakeNas(), username="u", password="p")
+        server_task = asyncio.create_task(server.async_serve(port=args.port))
+        endpoint = f"127.0.0.1:{args.port}"
+        await asyncio.sleep(0.5)
+
+    problems = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = make_config_entry({}, host=endpoint)
+        client = FnosClient()
+        connection = FnosConnection(
+            client, endpoint, args.username, args.password
+        )
+        device = FnosDevice()
+        coordinators = {}
+        try:
+            async with asyncio.timeout(args.timeout):
+                await connection.async_connect()
+                coordinators = {
+                    tier: FnosCoordinator(
+                        hass, entry, connection, tier, device
+                    )
+                    for tier in (TIER_SLOW, TIER_MEDIUM, TIER_FAST)
+                }
+                await async_first_refresh(coordinators)
+                for coordinator in coordinators.values():
+                    if coordinator.needs_warm_up:
+                        await coordinator.async_refresh()
+        except TimeoutError:
+            problems.append(f"setup took more than {args.timeout} s")
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            problems.append(f"setup failed: {err!r}")
+
+        if not problems:
+            if device.machine_id is None:
+                problems.append("no machine id")
+            if device.host_name is None or device.trim_version is None:
+                problems.append("no host name or trim version")
+            for tier, coordinator in coordinators.items():
+                if not coordinator.last_update_success:
+                    problems.append(f"{tier} refresh failed")
+
+            entry.runtime_data = FnosData(
+                api=client,
+                connection=connection,
+                coordinators=coordinators,
+                options=dict(entry.options),
+            )
+            entities = []
+            await sensor.async_setup_entry(hass, entry, entities.extend)
+            if not entities:
+                problems.append("no sensors")
+            print(
+                f"{device.host_name} (fnOS {device.trim_version}):"
+                f" {len(entities)} sensors"
+            )
+
+        for coordinator in coordinators.values():
+            await coordinator.async_shutdown()
+        await connection.async_close()
+        await hass.async_stop(force=True)
+        if server_task is not None:
+            server_task.cancel()
+    return problems
+
+
+def main() -> None:
+    """Parse the arguments and run the check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoint", help="fnOS to check against, host:port")
+    parser.add_argument("--username", default="u")
+    parser.add_argument("--password", default="p")
+    parser.add_argument("--port", type=int, default=5666)
+    parser.add_argument(
+        "--timeout", type=float, default=30,
+        help="time allowed for the whole setup in seconds",
+    )
+    problems = asyncio.run(_async_check(parser.parse_args()))
+    for problem in problems:
+        print(f"FAILED: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
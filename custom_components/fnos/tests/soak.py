@@ -0,0 +1,200 @@
+"""Soak test of the fnOS coordinators against a fnOS websocket server.
+
+Runs the three tier coordinators with the real fnos client for a long
+time, all sections listened to, and periodically reports memory use,
+refresh latency, reconnects and failed calls. Without --endpoint a
+FakeFnosServer is started in-process with the given knobs; drops and
+outages only start once the coordinators are set up.
+
+    python -m custom_components.fnos.tests.soak --duration 14400 \\
+        --disks 24 --latency 0.05 --jitter 0.05 --drop-rate 0.001
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from functools import partial
+import gc
+import json
+import os
+import resource
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+
+from fnos import FnosClient
+
+from .. import FnosData, on_message_handler
+from ..connection import FnosConnection
+from ..const import (
+    CONF_FAST_INTERVAL,
+    CONF_MEDIUM_INTERVAL,
+    CONF_PUSH,
+    CONF_SLOW_INTERVAL,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SECTIONS,
+    TIER_SLOW,
+)
+from ..coordinator import FnosCoordinator, FnosDevice
+from ..scheduler import async_get_scheduler
+from .benchmark import async_first_refresh, make_config_entry
+from .fake_nas import FakeNas
+from .fake_server import FakeFnosServer
+
+
+def _rss() -> int:
+    """Return the resident set size of the process in bytes."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak rather than current outside Linux, still shows growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _report(start: float, connection: FnosConnection, server) -> dict:
+    """Return one line of the report."""
+    stats = connection.stats
+    line = {
+        "elapsed": round(time.monotonic() - start),
+        "rss_mib": round(_rss() / (1 << 20), 1),
+        "objects": len(gc.get_objects()),
+        "refresh_ms": {
+            tier: round(duration, 1)
+            for tier, duration in stats.refresh_durations.items()
+        },
+        "p95_ms": {
+            group: round(endpoint.p95, 1)
+            for group, endpoint in stats.endpoints.items()
+            if endpoint.p95 is not None
+        },
+        "reconnects": stats.reconnects,
+        "failed_calls": stats.failed_calls,
+        "connected": connection.api.connected,
+    }
+    if server is not None:
+        line["server"] = dict(server.stats)
+    return line
+
+
+async def _async_soak(args) -> None:
+    """Run the soak test."""
+    server = None
+    server_task = None
+    endpoint = args.endpoint
+    if endpoint is None:
+        server = FakeFnosServer(
+            FakeNas(
+                disks=args.disks,
+                volumes=args.volumes,
+                interfaces=args.interfaces,
+            ),
+            latency=args.latency,
+            jitter=args.jitter,
+            push_interval=args.push_interval,
+            token_ttl=args.token_ttl,
+        )
+        server_task = asyncio.create_task(server.async_serve(port=args.port))
+        endpoint = f"127.0.0.1:{args.port}"
+        await asyncio.sleep(0.5)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = make_config_entry(
+            {
+                CONF_FAST_INTERVAL: args.fast_interval,
+                CONF_MEDIUM_INTERVAL: args.medium_interval,
+                CONF_SLOW_INTERVAL: args.slow_interval,
+                CONF_PUSH: args.push,
+            },
+            host=endpoint,
+        )
+        client = FnosClient()
+        connection = FnosConnection(
+            client, endpoint, args.username, args.password
+        )
+        await connection.async_connect()
+
+        device = FnosDevice()
+        coordinators = {
+            tier: FnosCoordinator(hass, entry, connection, tier, device)
+            for tier in (TIER_SLOW, TIER_MEDIUM, TIER_FAST)
+        }
+        entry.runtime_data = FnosData(
+            api=client,
+            connection=connection,
+            coordinators=coordinators,
+            options=dict(entry.options),
+        )
+        if args.push:
+            client.on_message(partial(on_message_handler, client, coordinators))
+        await async_first_refresh(coordinators)
+        for coordinator in coordinators.values():
+            if coordinator.needs_warm_up:
+                await coordinator.async_refresh()
+        # A dropped setup call would end the run before it began
+        if server is not None:
+            server.set_faults(
+                args.drop_rate, args.outage_every, args.outage_for
+            )
+        scheduler = async_get_scheduler(hass)
+        unregisters = [
+            scheduler.async_register(coordinator)
+            for coordinator in coordinators.values()
+        ]
+
+        # Listen to every section, as if all entities were enabled
+        unsubscribes = [
+            coordinator.async_add_listener(lambda: None, section)
+            for tier, coordinator in coordinators.items()
+            for section in TIER_SECTIONS[tier]
+        ]
+
+        start = time.monotonic()
+        try:
+            while time.monotonic() - start < args.duration:
+                await asyncio.sleep(args.report_every)
+                line = _report(start, connection, server)
+                print(json.dumps(line), flush=True)
+        finally:
+            for unsubscribe in (*unsubscribes, *unregisters):
+                unsubscribe()
+            for coordinator in coordinators.values():
+                await coordinator.async_shutdown()
+            await connection.async_close()
+            await hass.async_stop(force=True)
+            if server_task is not None:
+                server_task.cancel()
+
+
+def main() -> None:
+    """Parse the arguments and run the soak test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--endpoint", help="fnOS to test against, host:port")
+    parser.add_argument("--username", default="u")
+    parser.add_argument("--password", default="p")
+    parser.add_argument("--duration", type=float, default=3600)
+    parser.add_argument("--report-every", type=float, default=60)
+    parser.add_argument("--fast-interval", type=int, default=5)
+    parser.add_argument("--medium-interval", type=int, default=60)
+    parser.add_argument("--slow-interval", type=int, default=3600)
+    parser.add_argument("--push", action="store_true")
+    # Knobs of the in-process fake server
+    parser.add_argument("--port", type=int, default=5666)
+    parser.add_argument("--disks", type=int, default=5)
+    parser.add_argument("--volumes", type=int, default=2)
+    parser.add_argument("--interfaces", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--outage-every", type=float, default=0.0)
+    parser.add_argument("--outage-for", type=float, default=0.0)
+    parser.add_argument("--push-interval", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=0.0)
+    asyncio.run(_async_soak(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Check that the fleet scheduler skips tiers no entity listens to.
+
+Registers the coordinators of a fake NAS with the scheduler while only
+passive listeners, such as those of the snapshot, the statistics and
+the inventory, are attached, and checks no tier is refreshed or sampled.
+Then an entity listener is added to the fast tier, which alone must be
+polled.
+Exits non-zero if anything is off.
+
+    python -m custom_components.fnos.tests.suspend_check
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+
+from homeassistant.core import HomeAssistant
+
+from ..connection import FnosConnection
+from ..const import (
+    CONF_FAST_INTERVAL,
+    CONF_MEDIUM_INTERVAL,
+    CONF_SAMPLE_INTERVAL,
+    CONF_SLOW_INTERVAL,
+    SECTION_CPU,
+    SECTION_DISK,
+    SECTION_NET,
+    SECTION_STORE,
+    TIER_FAST,
+    TIER_MEDIUM,
+    TIER_SLOW,
+)
+from ..coordinator import FnosCoordinator, FnosDevice
+from ..scheduler import async_get_scheduler
+from .benchmark import async_first_refresh, make_config_entry
+from .fake_nas import FakeFnosClient, FakeNas
+
+
+def _refreshed_tiers(stats, cycles: int) -> set[str]:
+    """Return the tiers refreshed after the first cycles were recorded."""
+    return {cycle.tier for cycle in list(stats.cycles)[cycles:]}
+
+
+async def _async_check(args) -> list[str]:
+    """Run the scheduler with passive listeners, return the problems found."""
+    problems = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = make_config_entry(
+            {
+                CONF_FAST_INTERVAL: 1,
+                CONF_MEDIUM_INTERVAL: 1,
+                CONF_SLOW_INTERVAL: 1,
+                CONF_SAMPLE_INTERVAL: 0.5,
+            }
+        )
+        client = FakeFnosClient(FakeNas())
+        connection = FnosConnection(client, "fake:5666", "u", "p")
+        await connection.async_connect()
+        stats = connection.stats
+
+        device = FnosDevice()
+        coordinators = {
+            tier: FnosCoordinator(hass, entry, connection, tier, device)
+            for tier in (TIER_SLOW, TIER_MEDIUM, TIER_FAST)
+        }
+        await async_first_refresh(coordinators)
+
+        # As the snapshot, the statistics sensors and the inventories do
+        removes = [
+            coordinator.async_add_passive_listener(lambda: None)
+            for coordinator in coordinators.values()
+        ]
+        removes.extend(
+            coordinators[tier].async_add_inventory_listener(
+                section, lambda added, removed: None
+            )
+            for tier, section in (
+                (TIER_SLOW, SECTION_DISK),
+                (TIER_MEDIUM, SECTION_STORE),
+                (TIER_FAST, SECTION_NET),
+            )
+        )
+        for tier, coordinator in coordinators.items():
+            if not coordinator.suspended:
+                problems.append(f"{tier} tier not suspended")
+
+        scheduler = async_get_scheduler(hass)
+        removes.extend(
+            scheduler.async_register(coordinator)
+            for coordinator in coordinators.values()
+        )
+        removes.extend(
+            coordinator.async_start_sampling()
+            for coordinator in coordinators.values()
+            if coordinator.sampler is not None
+        )
+        cycles, requests = len(stats.cycles), client.requests
+        await asyncio.sleep(args.wait)
+        if tiers := _refreshed_tiers(stats, cycles):
+            problems.append(f"suspended tiers refreshed: {sorted(tiers)}")
+        if client.requests != requests:
+            problems.append(
+                f"{client.requests - requests} requests while suspended"
+            )
+
+        fast = coordinators[TIER_FAST]
+        removes.append(fast.async_add_listener(lambda: None, SECTION_CPU))
+        if fast.suspended:
+            problems.append("fast tier suspended with an entity listening")
+        cycles = len(stats.cycles)
+        await asyncio.sleep(args.wait)
+        if (tiers := _refreshed_tiers(stats, cycles)) != {TIER_FAST}:
+            problems.append(f"refreshed {sorted(tiers)} instead of fast")
+
+        for remove in removes:
+            remove()
+        for coordinator in coordinators.values():
+            await coordinator.async_shutdown()
+        await connection.async_close()
+        await hass.async_stop(force=True)
+    return problems
+
+
+def main() -> None:
+    """Parse the arguments and run the check."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--wait", type=float, default=3,
+        help="time each step runs the scheduler for, in seconds",
+    )
+    problems = asyncio.run(_async_check(parser.parse_args()))
+    for problem in problems:
+        print(f"FAILED: {problem}", file=sys.stderr)
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()